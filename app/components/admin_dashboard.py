@@ -8,7 +8,7 @@ import pandas as pd
 from datetime import datetime, timedelta
 from app.database.operations import AdminOperations, UserOperations, InterviewOperations
 from app.config.settings import settings
-from app.services.storage_service import StorageService
+from app.services.storage_service import storage_service
 from app.services.llm_service import LLMService
 from app.services.twilio_service import TwilioService
 import logging
@@ -23,7 +23,7 @@ class AdminDashboard:
         self.admin_ops = AdminOperations()
         self.user_ops = UserOperations()
         self.interview_ops = InterviewOperations()
-        self.storage_service = StorageService()
+        self.storage_service = storage_service
         self.llm_service = LLMService()
         self.twilio_service = TwilioService()
 
@@ -353,8 +353,10 @@ class AdminDashboard:
         st.subheader("Storage Cleanup")
         days = st.slider("Delete files older than (days)", 1, 365, 30)
         if st.button("Clean Up Old Files"):
-            self.storage_service.cleanup_old_files(days)
-            st.success("Cleanup completed!")
+            if self.storage_service.cleanup_old_files(days):
+                st.success("Cleanup completed!")
+            else:
+                st.error("Cleanup failed. Check the logs for details.")
 
     def _render_system_logs(self):
         """Render system logs interface"""
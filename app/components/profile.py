@@ -5,7 +5,7 @@ from typing import Dict, Optional, List
 import logging
 from datetime import datetime
 from app.database.operations import UserOperations
-from app.services.storage_service import StorageService
+from app.services.storage_service import storage_service
 from app.utils.helpers import ValidationHelpers, UIHelpers
 from app.auth.authentication import require_auth
 from app.services.email_service import email_service
@@ -22,7 +22,7 @@ class ProfileComponent:
     def __init__(self):
         """Initialize profile component"""
         self.user_ops = UserOperations()
-        self.storage_service = StorageService()
+        self.storage_service = storage_service
         self.validators = ValidationHelpers()
         self.ui_helpers = UIHelpers()
 
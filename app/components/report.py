@@ -13,7 +13,7 @@ import tempfile
 from app.database.operations import InterviewOperations
 from app.auth.authentication import require_auth
 import logging
-from app.services.storage_service import StorageService
+from app.services.storage_service import storage_service
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +21,7 @@ class ReportComponent:
     def __init__(self):
         """Initialize report component"""
         self.interview_ops = InterviewOperations()
-        self.storage_service = StorageService()
+        self.storage_service = storage_service
         self.color_scheme = {
             'primary': '#3498db',
             'secondary': '#2ecc71',
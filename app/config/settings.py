@@ -37,6 +37,7 @@ class Settings(BaseSettings):
     TWILIO_ACCOUNT_SID: SecretStr = SecretStr(os.getenv("TWILIO_ACCOUNT_SID", ""))
     TWILIO_AUTH_TOKEN: SecretStr = SecretStr(os.getenv("TWILIO_AUTH_TOKEN", ""))
     TWILIO_PHONE_NUMBER: str = os.getenv("TWILIO_PHONE_NUMBER", "")
+    TWILIO_MAX_CONCURRENT_CALLS: int = int(os.getenv("TWILIO_MAX_CONCURRENT_CALLS", "10"))
 
     # Stripe Settings
     STRIPE_SECRET_KEY: SecretStr = Field(default=SecretStr(""))
@@ -53,6 +54,12 @@ class Settings(BaseSettings):
 
     # Firebase Settings
     FIREBASE_CREDENTIALS_PATH: str = Field(default="")
+
+    # In-app Notification Push Settings
+    NOTIFICATION_WS_HOST: str = Field(default="0.0.0.0")
+    NOTIFICATION_WS_PORT: int = Field(default=8765)
+    # Public WebSocket URL for browsers; derived from the page host if empty
+    NOTIFICATION_WS_URL: str = Field(default="")
     
     # JWT Settings
     JWT_SECRET: SecretStr = SecretStr(os.getenv("JWT_SECRET", "your-secret-key"))
@@ -1,6 +1,7 @@
 # app/main.py
 
 import streamlit as st
+import streamlit.components.v1 as components
 from pathlib import Path
 import sys
 import logging
@@ -169,6 +170,15 @@ class BeaverInterviewApp:
             # Clear notifications after displaying
             st.session_state.notifications = []
 
+        # Subscribe the browser to pushed in-app notifications, once per token
+        token = st.session_state.get('auth_token')
+        if token and st.session_state.get('notification_ws_token') != token:
+            components.html(
+                notification_service.get_in_app_client_html(token),
+                height=0
+            )
+            st.session_state.notification_ws_token = token
+
     @require_auth
     def render_home(self):
         """Render home page"""
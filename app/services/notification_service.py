@@ -8,8 +8,8 @@ import json
 from app.services.email_service import email_service
 from app.services.twilio_service import TwilioService
 from app.database.operations import UserOperations, NotificationOperations
+from app.auth.authentication import auth
 from app.config.settings import settings
-import streamlit as st
 from enum import Enum
 import queue
 import threading
@@ -17,6 +17,7 @@ from dataclasses import dataclass
 import firebase_admin
 from firebase_admin import messaging
 from firebase_admin import credentials
+import websockets
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,7 @@ class NotificationType(Enum):
     PAYMENT = "payment"
     SYSTEM = "system"
 
-@dataclass
+@dataclass(slots=True)
 class Notification:
     """Notification data class"""
     user_id: str
@@ -63,6 +64,15 @@ class NotificationService:
                 daemon=True
             )
             self.worker_thread.start()
+
+            # In-app push channel: browser clients subscribe over WebSocket
+            self._ws_clients: Dict[str, set] = {}
+            self._ws_loop = asyncio.new_event_loop()
+            self.ws_thread = threading.Thread(
+                target=self._run_ws_server,
+                daemon=True
+            )
+            self.ws_thread.start()
             
             # Notification templates
             self._load_notification_templates()
@@ -101,6 +111,24 @@ class NotificationService:
             }
         }
 
+        # Precompile message formatters so the send path skips template lookup
+        self._sms_formatters = {
+            name: template["message"].format_map
+            for name, template in self.templates.items()
+        }
+
+    def _render_message(self, notification: Notification) -> str:
+        """Render notification message from its template if one is referenced"""
+        data = notification.data or {}
+        formatter = self._sms_formatters.get(data.get('template'))
+        if formatter is None:
+            return notification.message
+        try:
+            return formatter(data)
+        except KeyError as e:
+            logger.warning(f"Missing template field {e}, using raw message")
+            return notification.message
+
     async def send_notification(self, notification: Notification) -> bool:
         """
         Send notification through specified channels
@@ -147,6 +175,97 @@ class NotificationService:
                 logger.error(f"Error in notification worker: {str(e)}")
                 continue
 
+    def _run_ws_server(self):
+        """Run the in-app notification WebSocket server in its own event loop"""
+        try:
+            asyncio.set_event_loop(self._ws_loop)
+            server = websockets.serve(
+                self._ws_handler,
+                settings.NOTIFICATION_WS_HOST,
+                settings.NOTIFICATION_WS_PORT
+            )
+            self._ws_loop.run_until_complete(server)
+            self._ws_loop.run_forever()
+        except Exception as e:
+            logger.error(f"Error in notification WebSocket server: {str(e)}")
+
+    async def _ws_handler(self, websocket):
+        """Authenticate a browser client and keep it subscribed until it disconnects"""
+        try:
+            token = await websocket.recv()
+            user_data = auth._verify_jwt_token(token)
+            if not user_data or not user_data.get('user_id'):
+                await websocket.close(code=4001, reason="Invalid token")
+                return
+
+            user_id = str(user_data['user_id'])
+            self._ws_clients.setdefault(user_id, set()).add(websocket)
+            try:
+                await websocket.wait_closed()
+            finally:
+                clients = self._ws_clients.get(user_id)
+                if clients is not None:
+                    clients.discard(websocket)
+                    if not clients:
+                        del self._ws_clients[user_id]
+        except websockets.ConnectionClosed:
+            pass
+        except Exception as e:
+            logger.error(f"Error in notification WebSocket handler: {str(e)}")
+
+    async def _push_to_clients(self, user_id: str, frame: str):
+        """Send a JSON frame to every open connection of a user"""
+        for websocket in list(self._ws_clients.get(user_id, ())):
+            try:
+                await websocket.send(frame)
+            except websockets.ConnectionClosed:
+                self._ws_clients.get(user_id, set()).discard(websocket)
+
+    def get_in_app_client_html(self, token: str) -> str:
+        """
+        Get the browser shim that subscribes to in-app notifications
+        
+        The subscriber is installed into the parent Streamlit page, where the
+        hostname is known and the socket survives reruns; the srcdoc iframe
+        this HTML renders in has no hostname of its own.
+        
+        Args:
+            token: JWT identifying the subscribing user
+            
+        Returns:
+            HTML for components.html
+        """
+        subscriber = f"""
+        (() => {{
+            const token = {json.dumps(token)};
+            const old = window.__beaverNotifications;
+            if (old && old.token === token && old.ws.readyState <= WebSocket.OPEN) return;
+            if (old) old.ws.close();
+            const url = {json.dumps(settings.NOTIFICATION_WS_URL)} ||
+                (location.protocol === "https:" ? "wss://" : "ws://") +
+                location.hostname + ":{settings.NOTIFICATION_WS_PORT}";
+            const ws = new WebSocket(url);
+            ws.onopen = () => ws.send(token);
+            ws.onmessage = (event) => {{
+                const notif = JSON.parse(event.data);
+                const el = document.createElement("div");
+                el.className = "notification " + notif.type;
+                el.textContent = notif.message;
+                document.querySelector(".main")?.prepend(el);
+            }};
+            window.__beaverNotifications = {{token, ws}};
+        }})();
+        """
+        return f"""
+        <script>
+        const doc = window.parent.document;
+        const script = doc.createElement("script");
+        script.textContent = {json.dumps(subscriber)};
+        doc.head.appendChild(script);
+        script.remove();
+        </script>
+        """
+
     async def _process_notification(self, notification: Notification):
         """Process single notification"""
         try:
@@ -208,7 +327,7 @@ class NotificationService:
             if user_data.get('phone'):
                 await self.twilio_service.send_sms(
                     user_data['phone'],
-                    notification.message
+                    self._render_message(notification)
                 )
         except Exception as e:
             logger.error(f"Error sending SMS notification: {str(e)}")
@@ -236,15 +355,16 @@ class NotificationService:
                                       user_data: Dict):
         """Send in-app notification"""
         try:
-            if 'notifications' not in st.session_state:
-                st.session_state.notifications = []
-            
-            st.session_state.notifications.append({
+            frame = json.dumps({
                 'type': notification.type.value,
                 'title': notification.title,
                 'message': notification.message,
-                'timestamp': datetime.utcnow()
+                'timestamp': datetime.utcnow().isoformat()
             })
+            asyncio.run_coroutine_threadsafe(
+                self._push_to_clients(str(notification.user_id), frame),
+                self._ws_loop
+            )
         except Exception as e:
             logger.error(f"Error sending in-app notification: {str(e)}")
 
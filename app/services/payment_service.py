@@ -14,13 +14,17 @@ import hashlib
 
 logger = logging.getLogger(__name__)
 
+# Resolve Stripe secrets once at import
+_STRIPE_KEY = settings.STRIPE_SECRET_KEY.get_secret_value()
+_WEBHOOK_SECRET = settings.STRIPE_WEBHOOK_SECRET.get_secret_value()
+stripe.api_key = _STRIPE_KEY
+
 class PaymentService:
     def __init__(self):
         """Initialize payment service with Stripe"""
         try:
-            stripe.api_key = settings.STRIPE_SECRET_KEY.get_secret_value()
             self.user_ops = UserOperations()
-            self.webhook_secret = settings.STRIPE_WEBHOOK_SECRET.get_secret_value()
+            self.webhook_secret = _WEBHOOK_SECRET
             
             # Price IDs for different plans
             self.price_ids = {
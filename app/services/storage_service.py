@@ -1,10 +1,22 @@
 # app/services/storage_service.py
 
 import os
+import io
+import asyncio
+import tempfile
+import threading
+import hashlib
 from typing import Optional, Tuple, List
-from datetime import datetime, timedelta
+import aiohttp
+from pybloom_live import ScalableBloomFilter
+from cachetools import LRUCache, TTLCache
+from gcloud.aio.storage import Storage as AsyncStorage
+from datetime import datetime, timedelta, timezone
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
+from google.cloud.storage.retry import DEFAULT_RETRY
 from google.cloud.exceptions import NotFound
+from google.api_core.exceptions import PreconditionFailed
 import logging
 import mimetypes
 import uuid
@@ -13,15 +25,64 @@ from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Blobs above this size are downloaded in concurrent chunks
+CONCURRENT_DOWNLOAD_THRESHOLD = 32 * 1024 * 1024
+
+# Resumable upload chunk size (must be a multiple of 256 KiB)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Maximum number of operations per GCS JSON API batch request
+BATCH_SIZE = 100
+
+# Top-level folders files are stored under (see _get_file_path)
+FILE_TYPES = ('general', 'resumes', 'avatars', 'recordings')
+
+# Listing page size and projected fields
+LIST_PAGE_SIZE = 1000
+LIST_FIELDS = "items(name,size,timeCreated,updated),nextPageToken"
+USAGE_FIELDS = "items(name,size),nextPageToken"
+
+# Default age, in days, past which cleanup_old_files deletes files
+DEFAULT_RETENTION_DAYS = 30
+CLEANUP_FIELDS = "items(name,updated),nextPageToken"
+
+# Per-user usage statistics are served from memory for this many seconds,
+# for at most this many users; idle entries simply expire
+USAGE_CACHE_TTL = 60
+USAGE_CACHE_MAX_USERS = 1024
+
+# Users whose upload digest filters are kept in memory
+SEEN_CACHE_MAX_USERS = 1024
+
 class StorageService:
+    # Shared across instances so every service reuses one connection pool
+    _client: Optional[storage.Client] = None
+    _bucket_verified = False
+
     def __init__(self):
         """Initialize Google Cloud Storage client"""
         try:
-            self.client = storage.Client()
+            if StorageService._client is None:
+                StorageService._client = storage.Client()
+            self.client = StorageService._client
             self.bucket = self.client.bucket(settings.BUCKET_NAME)
-            if not self.bucket.exists():
-                self.bucket = self.client.create_bucket(settings.BUCKET_NAME)
-                logger.info(f"Created new bucket: {settings.BUCKET_NAME}")
+            self._async_client: Optional[AsyncStorage] = None
+            self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+            # Per-user Bloom filters of uploaded content digests
+            self._seen: LRUCache = LRUCache(maxsize=SEEN_CACHE_MAX_USERS)
+            self._seen_lock = threading.Lock()
+            if not StorageService._bucket_verified:
+                if not self.bucket.exists():
+                    self.bucket = self.client.create_bucket(settings.BUCKET_NAME)
+                    logger.info(f"Created new bucket: {settings.BUCKET_NAME}")
+                StorageService._bucket_verified = True
+
+            # Cached usage stats keyed by user_id (None for the whole bucket)
+            self._usage_cache: TTLCache = TTLCache(
+                maxsize=USAGE_CACHE_MAX_USERS, ttl=USAGE_CACHE_TTL
+            )
+            self._usage_lock = threading.Lock()
         except Exception as e:
             logger.error(f"Failed to initialize storage service: {str(e)}")
             raise
@@ -54,23 +115,37 @@ class StorageService:
             Tuple of (success_status, file_url)
         """
         try:
-            # Generate safe filename and path
-            safe_filename = self._get_safe_filename(original_filename)
-            file_path = self._get_file_path(user_id, file_type, safe_filename)
+            digest, file_path = self._get_content_path(
+                file_data, original_filename, user_id, file_type
+            )
             
-            # Create blob and upload
+            # Create blob and skip the upload if this content is already stored
             blob = self.bucket.blob(file_path)
+            if self._is_seen(user_id, digest) and self._touch_blob(blob):
+                logger.info(f"File already uploaded: {file_path}")
+                return True, blob.public_url
             
             # Set content type
             content_type = mimetypes.guess_type(original_filename)[0]
             if content_type:
                 blob.content_type = content_type
 
-            # Upload the file
-            blob.upload_from_string(
-                file_data,
-                content_type=content_type
-            )
+            # Upload the file as a resumable upload; the generation
+            # precondition makes retries of the new object idempotent
+            blob.chunk_size = UPLOAD_CHUNK_SIZE
+            try:
+                blob.upload_from_string(
+                    file_data,
+                    content_type=content_type,
+                    if_generation_match=0,
+                    retry=DEFAULT_RETRY
+                )
+                self._record_upload(user_id, file_type, len(file_data))
+            except PreconditionFailed:
+                # Same content was stored concurrently or before the filter knew it
+                logger.info(f"File already exists: {file_path}")
+                self._touch_blob(blob)
+            self._mark_seen(user_id, digest)
 
             # Generate public URL
             url = blob.public_url
@@ -82,6 +157,245 @@ class StorageService:
             logger.error(f"Failed to upload file: {str(e)}")
             return False, None
 
+    def _get_content_path(self, file_data: bytes, original_filename: str,
+                          user_id: str, file_type: str) -> Tuple[str, str]:
+        """Get the content digest and content-addressed path, so identical uploads map to one object"""
+        digest = hashlib.sha256(file_data).hexdigest()
+        ext = Path(original_filename).suffix
+        return digest, f"{file_type}/{user_id}/{digest}{ext}"
+
+    def _get_seen_digests(self, user_id: str) -> ScalableBloomFilter:
+        """Get a user's digest filter, warming it from storage on first use"""
+        with self._seen_lock:
+            seen = self._seen.get(user_id)
+        if seen is None:
+            # List outside the lock so one user's warm-up does not block others
+            seen = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01)
+            for prefix in self._user_prefixes(user_id):
+                for blob in self._iter_blobs(prefix, "items(name),nextPageToken"):
+                    seen.add(Path(blob.name).stem)
+            with self._seen_lock:
+                seen = self._seen.setdefault(user_id, seen)
+        return seen
+
+    def _is_seen(self, user_id: str, digest: str) -> bool:
+        """Check whether a user has probably uploaded this content before"""
+        seen = self._get_seen_digests(user_id)
+        with self._seen_lock:
+            return digest in seen
+
+    def _mark_seen(self, user_id: str, digest: str):
+        """Record an uploaded content digest for a user"""
+        seen = self._get_seen_digests(user_id)
+        with self._seen_lock:
+            seen.add(digest)
+
+    def _touch_blob(self, blob: storage.Blob) -> bool:
+        """
+        Refresh a deduplicated object's update time so age-based cleanup
+        counts from the latest upload rather than the first
+        
+        Returns:
+            True if the object exists, False otherwise
+        """
+        try:
+            blob.metadata = {'last_uploaded': datetime.now(timezone.utc).isoformat()}
+            blob.patch()
+            return True
+        except NotFound:
+            return False
+
+    def upload_many(self,
+                    items: List[Tuple[bytes, str, str, str]],
+                    workers: int = 8) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Upload several files concurrently using a thread pool
+        
+        Args:
+            items: List of (file_data, original_filename, user_id, file_type)
+            workers: Maximum number of concurrent upload workers
+            
+        Returns:
+            List of (success_status, file_url) in the same order as items
+        """
+        try:
+            uploaded: List[Tuple[bool, Optional[str]]] = [(False, None)] * len(items)
+            pending = []
+            for index, (file_data, original_filename, user_id, file_type) in enumerate(items):
+                digest, file_path = self._get_content_path(
+                    file_data, original_filename, user_id, file_type
+                )
+                blob = self.bucket.blob(file_path)
+
+                # Skip content that is already stored, as upload_file does
+                if self._is_seen(user_id, digest) and self._touch_blob(blob):
+                    logger.info(f"File already uploaded: {file_path}")
+                    uploaded[index] = (True, blob.public_url)
+                    continue
+
+                blob.content_type = mimetypes.guess_type(original_filename)[0]
+                pending.append((index, digest, file_data, user_id, file_type, blob))
+
+            # File objects are only supported by thread workers; skip_if_exists
+            # applies the same generation precondition as upload_file
+            results = transfer_manager.upload_many(
+                [(io.BytesIO(item[2]), item[5]) for item in pending],
+                skip_if_exists=True,
+                worker_type=transfer_manager.THREAD,
+                max_workers=workers,
+                deadline=None
+            )
+
+            for (index, digest, file_data, user_id, file_type, blob), result in zip(pending, results):
+                if isinstance(result, PreconditionFailed):
+                    logger.info(f"File already exists: {blob.name}")
+                    self._touch_blob(blob)
+                elif isinstance(result, Exception):
+                    logger.error(f"Failed to upload file {blob.name}: {str(result)}")
+                    continue
+                else:
+                    self._record_upload(user_id, file_type, len(file_data))
+                self._mark_seen(user_id, digest)
+                uploaded[index] = (True, blob.public_url)
+
+            logger.info(f"Uploaded {sum(ok for ok, _ in uploaded)}/{len(items)} files")
+            return uploaded
+
+        except Exception as e:
+            logger.error(f"Failed to upload files: {str(e)}")
+            return [(False, None)] * len(items)
+
+    def _get_async_client(self) -> AsyncStorage:
+        """Get the aiohttp-based storage client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._close_stale_async_client()
+            self._async_client = AsyncStorage(session=aiohttp.ClientSession())
+            self._async_client_loop = loop
+        return self._async_client
+
+    def _close_stale_async_client(self):
+        """Close the client left by a previous event loop if that loop still runs"""
+        client, loop = self._async_client, self._async_client_loop
+        self._async_client = self._async_client_loop = None
+        if client is not None and loop.is_running():
+            # Still alive on another thread; close it there. A finished loop
+            # cannot run the close any more, so the client is just dropped.
+            asyncio.run_coroutine_threadsafe(client.close(), loop)
+
+    async def aclose(self):
+        """Close the async storage client of the running event loop"""
+        if self._async_client is not None and self._async_client_loop is asyncio.get_running_loop():
+            await self._async_client.close()
+            self._async_client = self._async_client_loop = None
+
+    async def upload_file_async(self,
+                                file_data: bytes,
+                                original_filename: str,
+                                user_id: str,
+                                file_type: str = 'general') -> Tuple[bool, Optional[str]]:
+        """
+        Upload a file to Google Cloud Storage without blocking the event loop
+        
+        Args:
+            file_data: The file content in bytes
+            original_filename: Original name of the file
+            user_id: ID of the user uploading the file
+            file_type: Type of file (e.g., 'resume', 'recording')
+            
+        Returns:
+            Tuple of (success_status, file_url)
+        """
+        try:
+            digest, file_path = self._get_content_path(
+                file_data, original_filename, user_id, file_type
+            )
+
+            # Skip the upload if this content is already stored
+            blob = self.bucket.blob(file_path)
+            if (await asyncio.to_thread(self._is_seen, user_id, digest)
+                    and await asyncio.to_thread(self._touch_blob, blob)):
+                logger.info(f"File already uploaded: {file_path}")
+                return True, blob.public_url
+
+            content_type = mimetypes.guess_type(original_filename)[0]
+
+            # Same generation precondition as upload_file
+            try:
+                await self._get_async_client().upload(
+                    settings.BUCKET_NAME,
+                    file_path,
+                    file_data,
+                    content_type=content_type,
+                    parameters={'ifGenerationMatch': '0'}
+                )
+                self._record_upload(user_id, file_type, len(file_data))
+            except aiohttp.ClientResponseError as e:
+                if e.status != 412:
+                    raise
+                logger.info(f"File already exists: {file_path}")
+                await asyncio.to_thread(self._touch_blob, blob)
+            await asyncio.to_thread(self._mark_seen, user_id, digest)
+
+            logger.info(f"Successfully uploaded file: {file_path}")
+            return True, blob.public_url
+
+        except Exception as e:
+            logger.error(f"Failed to upload file: {str(e)}")
+            return False, None
+
+    async def upload_many_async(self,
+                                items: List[Tuple[bytes, str, str, str]]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Upload several files concurrently on the event loop
+        
+        Args:
+            items: List of (file_data, original_filename, user_id, file_type)
+            
+        Returns:
+            List of (success_status, file_url) in the same order as items
+        """
+        return list(await asyncio.gather(
+            *(self.upload_file_async(*item) for item in items)
+        ))
+
+    async def download_file_async(self, file_path: str) -> Optional[bytes]:
+        """
+        Download a file from Google Cloud Storage without blocking the event loop
+        
+        Args:
+            file_path: Path to the file in storage
+            
+        Returns:
+            File content in bytes if successful, None otherwise
+        """
+        try:
+            return await self._get_async_client().download(
+                settings.BUCKET_NAME,
+                file_path
+            )
+        except Exception as e:
+            logger.error(f"Failed to download file: {str(e)}")
+            return None
+
+    async def delete_file_async(self, file_path: str) -> bool:
+        """
+        Delete a file from storage without blocking the event loop
+        
+        Args:
+            file_path: Path to the file in storage
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await self._get_async_client().delete(settings.BUCKET_NAME, file_path)
+            logger.info(f"Successfully deleted file: {file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete file: {str(e)}")
+            return False
+
     def download_file(self, file_path: str) -> Optional[bytes]:
         """
         Download a file from Google Cloud Storage
@@ -93,7 +407,13 @@ class StorageService:
             File content in bytes if successful, None otherwise
         """
         try:
-            blob = self.bucket.blob(file_path)
+            blob = self.bucket.get_blob(file_path)
+            if blob is None:
+                raise NotFound(file_path)
+
+            if blob.size and blob.size > CONCURRENT_DOWNLOAD_THRESHOLD:
+                return self._download_chunks_concurrently(blob)
+
             return blob.download_as_bytes()
         except NotFound:
             logger.error(f"File not found: {file_path}")
@@ -102,6 +422,20 @@ class StorageService:
             logger.error(f"Failed to download file: {str(e)}")
             return None
 
+    def _download_chunks_concurrently(self, blob: storage.Blob) -> bytes:
+        """Download a large blob in parallel chunks through a temp file"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = os.path.join(temp_dir, "download")
+            transfer_manager.download_chunks_concurrently(
+                blob,
+                temp_path,
+                chunk_size=CONCURRENT_DOWNLOAD_THRESHOLD,
+                max_workers=8,
+                worker_type=transfer_manager.PROCESS
+            )
+            with open(temp_path, "rb") as f:
+                return f.read()
+
     def generate_signed_url(self, file_path: str, 
                           expiration_minutes: int = 30) -> Optional[str]:
         """
@@ -145,6 +479,114 @@ class StorageService:
             logger.error(f"Failed to delete file: {str(e)}")
             return False
 
+    def bulk_delete(self, file_paths: List[str]) -> bool:
+        """
+        Delete several files using batched requests
+        
+        Args:
+            file_paths: Paths to the files in storage
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self._delete_blobs(self.bucket.blob(path) for path in file_paths)
+            logger.info(f"Successfully deleted {len(file_paths)} files")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete files: {str(e)}")
+            return False
+
+    def _delete_blobs(self, blobs) -> int:
+        """Delete blobs in batches of BATCH_SIZE, returning the number deleted"""
+        deleted = 0
+        chunk = []
+        for blob in blobs:
+            chunk.append(blob)
+            if len(chunk) == BATCH_SIZE:
+                deleted += self._delete_batch(chunk)
+                chunk = []
+        if chunk:
+            deleted += self._delete_batch(chunk)
+        return deleted
+
+    def _delete_batch(self, blobs: List[storage.Blob]) -> int:
+        """Delete up to BATCH_SIZE blobs in a single HTTP request"""
+        with self.client.batch():
+            for blob in blobs:
+                blob.delete()
+        return len(blobs)
+
+    def _iter_blobs(self, prefix: Optional[str], fields: str):
+        """Stream blobs under a prefix page by page with a fields projection"""
+        blobs = self.client.list_blobs(
+            self.bucket,
+            prefix=prefix,
+            page_size=LIST_PAGE_SIZE,
+            fields=fields
+        )
+        for page in blobs.pages:
+            yield from page
+
+    def _user_prefixes(self, user_id: Optional[str],
+                       file_type: Optional[str] = None) -> List[Optional[str]]:
+        """Get listing prefixes for a user; GCS prefixes do not support wildcards"""
+        if user_id is None:
+            return [f"{file_type}/" if file_type else None]
+        file_types = [file_type] if file_type else FILE_TYPES
+        return [f"{ftype}/{user_id}/" for ftype in file_types]
+
+    def _scan_user_files(self, user_id: Optional[str],
+                         file_type: Optional[str] = None,
+                         include_files: bool = True) -> Tuple[List[dict], dict]:
+        """List a user's files and aggregate their usage in a single pass"""
+        files = []
+        total_size = 0
+        file_types = {}
+        fields = LIST_FIELDS if include_files else USAGE_FIELDS
+
+        for prefix in self._user_prefixes(user_id, file_type):
+            for blob in self._iter_blobs(prefix, fields):
+                total_size += blob.size
+                ftype = blob.name.split('/')[0]
+                file_types[ftype] = file_types.get(ftype, 0) + 1
+                if include_files:
+                    files.append({
+                        'name': blob.name.split('/')[-1],
+                        'path': blob.name,
+                        'size': blob.size,
+                        'created': blob.time_created,
+                        'updated': blob.updated,
+                        'url': blob.public_url
+                    })
+
+        stats = {
+            'total_size_bytes': total_size,
+            'total_size_mb': round(total_size / (1024 * 1024), 2),
+            'file_count': sum(file_types.values()),
+            'file_types': file_types
+        }
+        return files, stats
+
+    def _cache_usage(self, user_id: Optional[str], stats: dict):
+        """Store usage stats for a user"""
+        with self._usage_lock:
+            self._usage_cache[user_id] = stats
+
+    def _record_upload(self, user_id: str, file_type: str, size: int):
+        """Optimistically add a new upload to cached usage stats"""
+        with self._usage_lock:
+            for key in (user_id, None):
+                stats = self._usage_cache.get(key)
+                if stats is None:
+                    continue
+                stats['total_size_bytes'] += size
+                stats['total_size_mb'] = round(
+                    stats['total_size_bytes'] / (1024 * 1024), 2
+                )
+                stats['file_count'] += 1
+                stats['file_types'][file_type] = stats['file_types'].get(file_type, 0) + 1
+
     def list_user_files(self, user_id: str, 
                        file_type: Optional[str] = None) -> List[dict]:
         """
@@ -158,58 +600,34 @@ class StorageService:
             List of file information dictionaries
         """
         try:
-            prefix = f"{file_type}/{user_id}/" if file_type else f"*/{user_id}/"
-            blobs = self.bucket.list_blobs(prefix=prefix)
-            
-            files = []
-            for blob in blobs:
-                files.append({
-                    'name': blob.name.split('/')[-1],
-                    'path': blob.name,
-                    'size': blob.size,
-                    'created': blob.time_created,
-                    'updated': blob.updated,
-                    'url': blob.public_url
-                })
+            files, stats = self._scan_user_files(user_id, file_type)
+            if file_type is None:
+                self._cache_usage(user_id, stats)
             return files
         except Exception as e:
             logger.error(f"Failed to list files: {str(e)}")
             return []
 
-    def get_storage_usage(self, user_id: str) -> dict:
+    def get_storage_usage(self, user_id: Optional[str]) -> dict:
         """
         Get storage usage statistics for a user
         
         Args:
-            user_id: ID of the user
+            user_id: ID of the user, or None for the whole bucket
             
         Returns:
             Dictionary with storage statistics
         """
         try:
-            total_size = 0
-            file_count = 0
-            file_types = {}
-
-            blobs = self.bucket.list_blobs(prefix=f"*/{user_id}/")
-            
-            for blob in blobs:
-                total_size += blob.size
-                file_count += 1
-                
-                # Count files by type
-                file_type = blob.name.split('/')[0]
-                if file_type in file_types:
-                    file_types[file_type] += 1
-                else:
-                    file_types[file_type] = 1
+            with self._usage_lock:
+                cached = self._usage_cache.get(user_id)
+                if cached is not None:
+                    # Copy, since _record_upload updates cached stats in place
+                    return {**cached, 'file_types': dict(cached['file_types'])}
 
-            return {
-                'total_size_bytes': total_size,
-                'total_size_mb': round(total_size / (1024 * 1024), 2),
-                'file_count': file_count,
-                'file_types': file_types
-            }
+            _, stats = self._scan_user_files(user_id, include_files=False)
+            self._cache_usage(user_id, stats)
+            return {**stats, 'file_types': dict(stats['file_types'])}
         except Exception as e:
             logger.error(f"Failed to get storage usage: {str(e)}")
             return {
@@ -219,7 +637,7 @@ class StorageService:
                 'file_types': {}
             }
 
-    def cleanup_old_files(self, days: int = 30) -> bool:
+    def cleanup_old_files(self, days: int = DEFAULT_RETENTION_DAYS) -> bool:
         """
         Clean up files older than specified days
         
@@ -230,24 +648,24 @@ class StorageService:
             True if successful, False otherwise
         """
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            blobs = self.bucket.list_blobs()
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+            blobs = self._iter_blobs(None, CLEANUP_FIELDS)
             
-            for blob in blobs:
-                if blob.time_created < cutoff_date:
-                    blob.delete()
-                    logger.info(f"Deleted old file: {blob.name}")
+            deleted = self._delete_blobs(
+                blob for blob in blobs if blob.updated < cutoff_date
+            )
+            logger.info(f"Deleted {deleted} old files")
             
             return True
         except Exception as e:
             logger.error(f"Failed to cleanup old files: {str(e)}")
             return False
 
+# Initialize storage service
+storage_service = StorageService()
+
 # Usage example
 if __name__ == "__main__":
-    # Test storage service
-    storage_service = StorageService()
-    
     # Test file upload
     test_content = b"Hello, World!"
     success, url = storage_service.upload_file(
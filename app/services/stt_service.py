@@ -4,6 +4,7 @@
 
 from typing import Dict, List, Optional, Tuple, Union, AsyncGenerator
 import logging
+import os
 from datetime import datetime
 import wave
 import io
@@ -11,22 +12,58 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import tempfile
+import uuid
 import soundfile as sf
 import numpy as np
-from pydub import AudioSegment
+from numba import njit, prange
+from scipy import signal
 import json
+import orjson
+import aiofiles
 from google.cloud import speech_v1
-from google.cloud.speech_v1 import SpeechClient
+from google.cloud.speech_v1 import SpeechClient, SpeechAsyncClient
+from google.cloud import speech_v2
 from google.cloud import storage
+from app.config.settings import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Audio format expected by the recognition configs
+TARGET_SAMPLE_RATE = 16000
+
+# Audio up to this length is streamed instead of submitted as a long-running job
+SHORT_AUDIO_MAX_SECONDS = 60
+
+# 100 ms of 16 kHz mono LINEAR16 audio
+STREAM_FRAME_BYTES = 3200
+
+# Bucket folder for multi-file batch recognition output (inline output
+# is only allowed for single-file batches)
+BATCH_OUTPUT_PREFIX = "transcripts/batch"
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _i16_to_f32_mono(samples: np.ndarray) -> np.ndarray:
+    """Downmix int16 PCM frames to float32 mono in [-1, 1] in a single pass"""
+    frames, channels = samples.shape
+    out = np.empty(frames, dtype=np.float32)
+    scale = np.float32(1.0 / (32768.0 * channels))
+    for i in prange(frames):
+        acc = np.float32(0.0)
+        for c in range(channels):
+            acc += np.float32(samples[i, c])
+        out[i] = acc * scale
+    return out
+
 class STTService:
     def __init__(self):
         """Initialize the Speech-to-Text service"""
         try:
             self.client = SpeechClient()
+            self._async_client: Optional[SpeechAsyncClient] = None
+            self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+            self._batch_client: Optional[speech_v2.SpeechClient] = None
+            self._storage_client: Optional[storage.Client] = None
             self.temp_dir = Path(tempfile.gettempdir()) / "beaver_stt"
             self.temp_dir.mkdir(exist_ok=True)
             
@@ -66,7 +103,8 @@ class STTService:
     async def transcribe_audio(self,
                              audio_file_path: str,
                              language_code: str = "en-US",
-                             enhanced: bool = False) -> Tuple[bool, Optional[Dict]]:
+                             enhanced: bool = False,
+                             include_words: bool = True) -> Tuple[bool, Optional[Dict]]:
         """
         Transcribe audio file to text
         
@@ -74,6 +112,7 @@ class STTService:
             audio_file_path: Path to the audio file
             language_code: Language code for transcription
             enhanced: Whether to use enhanced recognition
+            include_words: Whether to include word-level timings
             
         Returns:
             Tuple of (success_status, transcription_result)
@@ -87,51 +126,53 @@ class STTService:
             # Convert audio to proper format if needed
             processed_audio_path = await self._prepare_audio_file(audio_file_path)
             
-            # Read the audio file
-            with io.open(processed_audio_path, "rb") as audio_file:
-                content = audio_file.read()
-            
-            # Create audio object
-            audio = speech_v1.RecognitionAudio(content=content)
-            
             # Get recognition config
             config = self.recognition_configs["enhanced" if enhanced else "default"]
             config.language_code = language_code
             
-            # Perform transcription
-            operation = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.client.long_running_recognize,
-                config,
-                audio
-            )
+            # Short audio is streamed as raw PCM frames
+            with wave.open(processed_audio_path, "rb") as wav_file:
+                frame_count = wav_file.getnframes()
+                pcm = None
+                if frame_count / wav_file.getframerate() <= SHORT_AUDIO_MAX_SECONDS:
+                    pcm = wav_file.readframes(frame_count)
             
-            response = operation.result()
+            if pcm is not None:
+                results = await self._transcribe_short(pcm, config)
+            else:
+                # Read the audio file
+                with io.open(processed_audio_path, "rb") as audio_file:
+                    content = audio_file.read()
+                
+                # Create audio object
+                audio = speech_v1.RecognitionAudio(content=content)
+                
+                # Perform transcription
+                operation = await self._get_async_client().long_running_recognize(
+                    config=config,
+                    audio=audio
+                )
+                
+                results = (await operation.result()).results
             
             # Process results
+            alternatives = [result.alternatives[0] for result in results]
             transcription = {
-                "text": "",
-                "confidence": 0.0,
-                "words": [],
+                "text": " ".join(alt.transcript for alt in alternatives),
+                "confidence": max((alt.confidence for alt in alternatives), default=0.0),
+                "words": [
+                    {
+                        "word": word_info.word,
+                        "start_time": word_info.start_time.total_seconds(),
+                        "end_time": word_info.end_time.total_seconds()
+                    }
+                    for alt in alternatives
+                    for word_info in alt.words
+                ] if include_words else [],
                 "speakers": [] if enhanced else None
             }
             
-            for result in response.results:
-                transcription["text"] += result.alternatives[0].transcript + " "
-                transcription["confidence"] = max(
-                    transcription["confidence"],
-                    result.alternatives[0].confidence
-                )
-                
-                # Add word-level information
-                for word_info in result.alternatives[0].words:
-                    transcription["words"].append({
-                        "word": word_info.word,
-                        "start_time": word_info.start_time.total_seconds(),
-                        "end_time": word_info.end_time.total_seconds(),
-                        "confidence": result.alternatives[0].confidence
-                    })
-                
+            for result in results:
                 # Add speaker diarization if enabled
                 if enhanced and result.speaker_tags:
                     current_speaker = None
@@ -165,23 +206,72 @@ class STTService:
             logger.error(f"Failed to transcribe audio: {str(e)}")
             return False, None
 
+    def _get_async_client(self) -> SpeechAsyncClient:
+        """Get the async Speech client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._close_stale_async_client()
+            self._async_client = SpeechAsyncClient()
+            self._async_client_loop = loop
+        return self._async_client
+
+    def _close_stale_async_client(self):
+        """Close the client left by a previous event loop if that loop still runs"""
+        client, loop = self._async_client, self._async_client_loop
+        self._async_client = self._async_client_loop = None
+        if client is not None and loop.is_running():
+            # Still alive on another thread; close it there. A finished loop
+            # cannot run the close any more, so the client is just dropped.
+            asyncio.run_coroutine_threadsafe(client.transport.close(), loop)
+
+    async def aclose(self):
+        """Close the async Speech client of the running event loop"""
+        if self._async_client is not None and self._async_client_loop is asyncio.get_running_loop():
+            await self._async_client.transport.close()
+            self._async_client = self._async_client_loop = None
+
+    async def _transcribe_short(self,
+                                pcm: bytes,
+                                config: speech_v1.RecognitionConfig) -> List:
+        """Transcribe short raw PCM audio with streaming recognition"""
+        streaming_config = speech_v1.StreamingRecognitionConfig(config=config)
+
+        async def request_generator():
+            yield speech_v1.StreamingRecognizeRequest(
+                streaming_config=streaming_config
+            )
+            for i in range(0, len(pcm), STREAM_FRAME_BYTES):
+                yield speech_v1.StreamingRecognizeRequest(
+                    audio_content=pcm[i:i + STREAM_FRAME_BYTES]
+                )
+
+        responses = await self._get_async_client().streaming_recognize(
+            requests=request_generator()
+        )
+        results = []
+        async for response in responses:
+            results.extend(result for result in response.results if result.is_final)
+        return results
+
     async def _prepare_audio_file(self, file_path: str) -> str:
         """Prepare audio file for transcription"""
         try:
             # Check file format
-            audio = AudioSegment.from_file(file_path)
-            
-            # Convert to proper format if needed
-            if audio.frame_rate != 16000 or audio.channels != 1:
-                # Convert to 16kHz mono
-                audio = audio.set_frame_rate(16000).set_channels(1)
-                
-                # Save to temporary file
-                output_path = str(self.temp_dir / f"processed_{Path(file_path).name}")
-                audio.export(output_path, format="wav")
-                return output_path
-            
-            return file_path
+            info = sf.info(file_path)
+            if (info.format == 'WAV' and info.subtype == 'PCM_16'
+                    and info.samplerate == TARGET_SAMPLE_RATE and info.channels == 1):
+                return file_path
+
+            # Convert to 16kHz mono, keeping samples in a float32 array
+            samples, sample_rate = sf.read(file_path, dtype='int16', always_2d=True)
+            data = _i16_to_f32_mono(samples)
+            if sample_rate != TARGET_SAMPLE_RATE:
+                data = signal.resample_poly(data, TARGET_SAMPLE_RATE, sample_rate)
+
+            # Save to temporary file
+            output_path = str(self.temp_dir / f"processed_{Path(file_path).stem}.wav")
+            sf.write(output_path, data, TARGET_SAMPLE_RATE, subtype='PCM_16')
+            return output_path
 
         except Exception as e:
             logger.error(f"Failed to prepare audio file: {str(e)}")
@@ -256,13 +346,122 @@ class STTService:
                 "error": str(e)
             }
 
+    async def transcribe_batch(self,
+                               gcs_uris: List[str],
+                               language_code: str = "en-US",
+                               include_words: bool = True) -> Dict[str, Dict]:
+        """
+        Transcribe several audio files stored in GCS with one batch operation
+        
+        Args:
+            gcs_uris: gs:// URIs of the audio files
+            language_code: Language code for transcription
+            include_words: Whether to include word-level timings
+            
+        Returns:
+            Dictionary mapping each URI to its transcription result
+        """
+        try:
+            if self._batch_client is None:
+                self._batch_client = speech_v2.SpeechClient()
+
+            if len(gcs_uris) == 1:
+                output_config = speech_v2.RecognitionOutputConfig(
+                    inline_response_config=speech_v2.InlineOutputConfig()
+                )
+            else:
+                output_config = speech_v2.RecognitionOutputConfig(
+                    gcs_output_config=speech_v2.GcsOutputConfig(
+                        uri=f"gs://{settings.BUCKET_NAME}/{BATCH_OUTPUT_PREFIX}/{uuid.uuid4()}/"
+                    )
+                )
+
+            request = speech_v2.BatchRecognizeRequest(
+                recognizer=(
+                    f"projects/{settings.GOOGLE_CLOUD_PROJECT}"
+                    "/locations/global/recognizers/_"
+                ),
+                config=speech_v2.RecognitionConfig(
+                    auto_decoding_config=speech_v2.AutoDetectDecodingConfig(),
+                    language_codes=[language_code],
+                    model="long",
+                    features=speech_v2.RecognitionFeatures(
+                        enable_automatic_punctuation=True,
+                        enable_word_time_offsets=include_words
+                    )
+                ),
+                files=[
+                    speech_v2.BatchRecognizeFileMetadata(uri=uri)
+                    for uri in gcs_uris
+                ],
+                recognition_output_config=output_config
+            )
+
+            operation = await asyncio.to_thread(
+                self._batch_client.batch_recognize,
+                request=request
+            )
+            response = await asyncio.to_thread(operation.result)
+
+            transcriptions = {}
+            for uri, file_result in response.results.items():
+                if file_result.error.code:
+                    logger.error(f"Failed to transcribe {uri}: {file_result.error.message}")
+                    continue
+                if len(gcs_uris) == 1:
+                    results = file_result.inline_result.transcript.results
+                else:
+                    results = await asyncio.to_thread(
+                        self._read_batch_output,
+                        file_result.cloud_storage_result.uri or file_result.uri
+                    )
+                alternatives = [
+                    result.alternatives[0]
+                    for result in results
+                    if result.alternatives
+                ]
+                transcriptions[uri] = {
+                    "text": " ".join(alt.transcript for alt in alternatives),
+                    "confidence": max((alt.confidence for alt in alternatives), default=0.0),
+                    "words": [
+                        {
+                            "word": word_info.word,
+                            "start_time": word_info.start_offset.total_seconds(),
+                            "end_time": word_info.end_offset.total_seconds()
+                        }
+                        for alt in alternatives
+                        for word_info in alt.words
+                    ] if include_words else [],
+                    "speakers": None
+                }
+            return transcriptions
+
+        except Exception as e:
+            logger.error(f"Failed to transcribe batch: {str(e)}")
+            return {}
+
+    def _read_batch_output(self, output_uri: str) -> List:
+        """Read and delete one file's batch recognition output from GCS"""
+        if self._storage_client is None:
+            self._storage_client = storage.Client()
+        blob = storage.Blob.from_string(output_uri, client=self._storage_client)
+        results = speech_v2.BatchRecognizeResults.from_json(
+            blob.download_as_bytes(),
+            ignore_unknown_fields=True
+        ).results
+        blob.delete()
+        return results
+
     async def save_transcription(self,
                                transcription: Dict,
                                output_path: str) -> bool:
         """Save transcription to file"""
         try:
-            with open(output_path, 'w') as f:
-                json.dump(transcription, f, indent=2)
+            async with aiofiles.open(output_path, 'wb') as f:
+                await f.write(orjson.dumps(
+                    transcription,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                ))
             return True
         except Exception as e:
             logger.error(f"Failed to save transcription: {str(e)}")
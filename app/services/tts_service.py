@@ -2,9 +2,12 @@
 
 import asyncio
 import edge_tts
+import io
 import logging
 import tempfile
 import os
+import hashlib
+import time
 from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 import json
@@ -13,14 +16,34 @@ from pathlib import Path
 import soundfile as sf
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor
+from math import gcd
+from scipy import signal
+
+try:
+    import soxr
+except ImportError:  # Fall back to SciPy's polyphase resampler
+    soxr = None
 
 logger = logging.getLogger(__name__)
 
+# How long the on-disk voice catalog stays valid
+VOICES_CACHE_TTL = 24 * 60 * 60
+
+# Maximum concurrent edge-tts syntheses per event loop
+SYNTH_CONCURRENCY = 4
+
 class TTSService:
     def __init__(self):
         """Initialize the TTS service"""
         self.default_voice = "en-US-ChristopherNeural"
         self.voices_cache = {}
+        # Voice catalog lock, bound to the loop that created it
+        self._voices_lock: Optional[asyncio.Lock] = None
+        self._voices_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Synthesis concurrency limit, bound to the loop that created it
+        self._synth_sem: Optional[asyncio.Semaphore] = None
+        self._synth_sem_loop: Optional[asyncio.AbstractEventLoop] = None
         self.temp_dir = Path(tempfile.gettempdir()) / "beaver_tts"
         self.temp_dir.mkdir(exist_ok=True)
         
@@ -62,17 +85,32 @@ class TTSService:
     async def load_available_voices(self) -> List[Dict]:
         """Load and cache available voices"""
         try:
-            if not self.voices_cache:
-                voices = await edge_tts.list_voices()
-                self.voices_cache = {
-                    voice["ShortName"]: voice
-                    for voice in voices
-                }
+            async with self._get_voices_lock():
+                if not self.voices_cache:
+                    cache_file = self.temp_dir / "voices.json"
+                    if (cache_file.exists() and
+                            time.time() - cache_file.stat().st_mtime < VOICES_CACHE_TTL):
+                        voices = json.loads(cache_file.read_text())
+                    else:
+                        voices = await edge_tts.list_voices()
+                        cache_file.write_text(json.dumps(voices))
+                    self.voices_cache = {
+                        voice["ShortName"]: voice
+                        for voice in voices
+                    }
             return list(self.voices_cache.values())
         except Exception as e:
             logger.error(f"Failed to load voices: {str(e)}")
             return []
 
+    def _get_voices_lock(self) -> asyncio.Lock:
+        """Get the voice catalog lock for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._voices_lock is None or self._voices_lock_loop is not loop:
+            self._voices_lock = asyncio.Lock()
+            self._voices_lock_loop = loop
+        return self._voices_lock
+
     def _get_voice_by_preference(self, 
                                accent: str = "default", 
                                gender: str = "male") -> str:
@@ -85,6 +123,16 @@ class TTSService:
             logger.error(f"Error getting voice preference: {str(e)}")
             return self.default_voice
 
+    def _cache_key(self, text: str, voice_name: str, style: str, output_format: str) -> str:
+        """Build the content-addressed cache key for a synthesis request"""
+        return hashlib.sha256(
+            f"{voice_name}|{style}|{output_format}|{text}".encode()
+        ).hexdigest()
+
+    def _touch(self, path: Path):
+        """Refresh a cached file's mtime so cleanup evicts least recently used files"""
+        os.utime(path, None)
+
     async def text_to_speech(self,
                            text: str,
                            voice_name: Optional[str] = None,
@@ -109,28 +157,41 @@ class TTSService:
             # Get style configuration
             style_config = self.voice_styles.get(style, self.voice_styles["professional"])
             
-            # Create unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"tts_{timestamp}_{voice_name}.{output_format}"
-            output_path = self.temp_dir / filename
+            # Serve identical requests from the local cache
+            cache_key = self._cache_key(text, voice_name, style, output_format)
+            output_path = self.temp_dir / f"tts_{cache_key}.{output_format}"
+            if output_path.exists():
+                self._touch(output_path)
+                logger.info(f"Serving cached speech: {output_path}")
+                return True, str(output_path)
 
-            # Create communicate instance
-            communicate = edge_tts.Communicate(
-                text,
-                voice_name,
-                rate=style_config["rate"],
-                volume=style_config["volume"],
-                pitch=style_config["pitch"]
-            )
+            # Generate speech (edge-tts emits MP3)
+            audio = await self._synthesize(text, voice_name, style_config)
 
-            # Generate speech
-            await communicate.save(str(output_path))
-
-            if output_format != "wav":
-                # Convert to desired format if needed
-                wav_path = output_path.with_suffix(".wav")
-                await self._convert_format(str(wav_path), str(output_path))
-                os.remove(wav_path)
+            # Write beside the cache entry and swap it in, so a concurrent
+            # identical request never serves a half-written file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.temp_dir, prefix=f"tts_{cache_key}.", suffix=".tmp"
+            )
+            os.close(fd)
+            try:
+                if output_format == "mp3":
+                    async with aiofiles.open(tmp_path, "wb") as f:
+                        await f.write(audio)
+                else:
+                    # Decode in memory and encode straight to the target format
+                    data, samplerate = sf.read(io.BytesIO(audio))
+                    sf.write(
+                        tmp_path,
+                        data,
+                        samplerate,
+                        format=output_format.upper(),
+                        subtype="PCM_16" if output_format == "wav" else None
+                    )
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
 
             logger.info(f"Successfully generated speech: {output_path}")
             return True, str(output_path)
@@ -139,14 +200,29 @@ class TTSService:
             logger.error(f"Failed to generate speech: {str(e)}")
             return False, None
 
-    async def _convert_format(self, input_path: str, output_path: str):
-        """Convert audio format using soundfile"""
-        try:
-            data, samplerate = sf.read(input_path)
-            sf.write(output_path, data, samplerate)
-        except Exception as e:
-            logger.error(f"Failed to convert audio format: {str(e)}")
-            raise
+    def _get_synth_semaphore(self) -> asyncio.Semaphore:
+        """Get the synthesis concurrency limit for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._synth_sem is None or self._synth_sem_loop is not loop:
+            self._synth_sem = asyncio.Semaphore(SYNTH_CONCURRENCY)
+            self._synth_sem_loop = loop
+        return self._synth_sem
+
+    async def _synthesize(self, text: str, voice_name: str, style_config: Dict) -> bytes:
+        """Stream synthesized audio from edge-tts into memory"""
+        async with self._get_synth_semaphore():
+            communicate = edge_tts.Communicate(
+                text,
+                voice_name,
+                rate=style_config["rate"],
+                volume=style_config["volume"],
+                pitch=style_config["pitch"]
+            )
+            buffer = io.BytesIO()
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    buffer.write(chunk["data"])
+            return buffer.getvalue()
 
     async def generate_interview_voice(self,
                                      text: str,
@@ -184,7 +260,7 @@ class TTSService:
             return False, None
 
     async def cleanup_old_files(self, max_age_hours: int = 24):
-        """Clean up old temporary files"""
+        """Clean up temporary files not used within max_age_hours"""
         try:
             current_time = datetime.now()
             for file_path in self.temp_dir.glob("tts_*"):
@@ -195,29 +271,64 @@ class TTSService:
         except Exception as e:
             logger.error(f"Failed to cleanup old files: {str(e)}")
 
+    def _read_and_resample(self, file_path: str, target_rate: int) -> np.ndarray:
+        """Read an audio file as float32 and resample it to target_rate"""
+        data, rate = sf.read(file_path, dtype='float32')
+        if rate != target_rate:
+            data = self._resample_audio(data, rate, target_rate)
+        return data
+
+    def _read_into(self, file_path: str, out: np.ndarray):
+        """Read an audio file directly into a preallocated buffer"""
+        with sf.SoundFile(file_path) as f:
+            f.read(frames=len(out), dtype='float32', out=out)
+
     async def concatenate_audio_files(self, 
                                     file_paths: List[str], 
                                     output_path: str) -> bool:
         """Concatenate multiple audio files"""
         try:
-            # Read all audio files
-            audio_data = []
-            sample_rate = None
-            
-            for file_path in file_paths:
-                data, rate = sf.read(file_path)
-                if sample_rate is None:
-                    sample_rate = rate
-                elif rate != sample_rate:
-                    # Resample if needed
-                    data = self._resample_audio(data, rate, sample_rate)
-                audio_data.append(data)
-
-            # Concatenate audio data
-            concatenated = np.concatenate(audio_data)
-            
-            # Write concatenated audio
-            sf.write(output_path, concatenated, sample_rate)
+            infos = [sf.info(file_path) for file_path in file_paths]
+            sample_rate = infos[0].samplerate
+            channels = infos[0].channels
+
+            # Resample mismatched files in parallel; soundfile releases the GIL
+            mismatched = [
+                i for i, info in enumerate(infos) if info.samplerate != sample_rate
+            ]
+            resampled = dict(zip(mismatched, await asyncio.gather(*(
+                asyncio.to_thread(self._read_and_resample, file_paths[i], sample_rate)
+                for i in mismatched
+            ))))
+
+            # Size the output exactly so every file is read into its own slice
+            lengths = [
+                len(resampled[i]) if i in resampled else info.frames
+                for i, info in enumerate(infos)
+            ]
+            total_frames = sum(lengths)
+            shape = (total_frames, channels) if channels > 1 else (total_frames,)
+            concatenated = np.empty(shape, dtype=np.float32)
+
+            reads = []
+            pos = 0
+            for i, (file_path, length) in enumerate(zip(file_paths, lengths)):
+                view = concatenated[pos:pos + length]
+                if i in resampled:
+                    view[:] = resampled[i]
+                else:
+                    reads.append(asyncio.to_thread(self._read_into, file_path, view))
+                pos += length
+            await asyncio.gather(*reads)
+
+            # Write concatenated audio; 16-bit PCM only applies to WAV output
+            is_wav = Path(output_path).suffix.lower() == '.wav'
+            sf.write(
+                output_path,
+                concatenated,
+                sample_rate,
+                subtype='PCM_16' if is_wav else None
+            )
             
             return True
         except Exception as e:
@@ -229,9 +340,11 @@ class TTSService:
                        dst_rate: int) -> np.ndarray:
         """Resample audio data to match target sample rate"""
         try:
-            from scipy import signal
-            return signal.resample(data, 
-                                 int(len(data) * dst_rate / src_rate))
+            data = np.ascontiguousarray(data, dtype=np.float32)
+            if soxr is not None:
+                return soxr.resample(data, src_rate, dst_rate, quality='HQ')
+            g = gcd(src_rate, dst_rate)
+            return signal.resample_poly(data, dst_rate // g, src_rate // g, axis=0)
         except Exception as e:
             logger.error(f"Failed to resample audio: {str(e)}")
             raise
@@ -1,32 +1,90 @@
 # app/services/twilio_service.py
 
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
+from requests.adapters import HTTPAdapter
 from twilio.base.exceptions import TwilioRestException
-from twilio.twiml.voice_response import VoiceResponse, Gather
+from xml.sax.saxutils import escape
 import logging
+import os
+import re
 from typing import Dict, Optional, List, Tuple
 import asyncio
-from datetime import datetime
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+import aiofiles
+from cachetools import TTLCache
 import json
+import uuid
 from pathlib import Path
 import tempfile
 from app.config.settings import settings
 from urllib.parse import urljoin
-import base64
 
 logger = logging.getLogger(__name__)
 
+_PHONE_RE = re.compile(r'^\+?1?\d{10,15}$')
+
+# TwiML templates, equivalent to the VoiceResponse output but built with str.format
+_TWIML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>'
+_INTERVIEW_TMPL = (
+    _TWIML_HEADER +
+    '<Response><Say voice="alice">{message}</Say>'
+    '<Gather enhanced="true" input="speech" language="en-US" '
+    'speechTimeout="auto" timeout="{timeout}" /></Response>'
+)
+_INTERVIEW_NO_GATHER_TMPL = (
+    _TWIML_HEADER +
+    '<Response><Say voice="alice">{message}</Say></Response>'
+)
+_CONFERENCE_TMPL = (
+    _TWIML_HEADER +
+    '<Response><Dial><Conference endConferenceOnExit="{moderator}" '
+    'record="record-from-start" recordingStatusCallback="/recording/callback" '
+    'startConferenceOnEnter="{moderator}">{room}</Conference></Dial></Response>'
+)
+
 class TwilioService:
     def __init__(self):
         """Initialize Twilio service"""
         try:
+            # Keep-alive connection pool shared by all Twilio REST calls
+            http_client = TwilioHttpClient(pool_connections=True)
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+            http_client.session.mount('http://', adapter)
+            http_client.session.mount('https://', adapter)
+
+            # Unwrap credentials once for the REST client and recording downloads
+            account_sid = settings.TWILIO_ACCOUNT_SID.get_secret_value()
+            auth_token = settings.TWILIO_AUTH_TOKEN.get_secret_value()
+            self._basic_auth = aiohttp.BasicAuth(account_sid, auth_token)
+
             self.client = Client(
-                settings.TWILIO_ACCOUNT_SID.get_secret_value(),
-                settings.TWILIO_AUTH_TOKEN.get_secret_value()
+                account_sid,
+                auth_token,
+                http_client=http_client
             )
             self.phone_number = settings.TWILIO_PHONE_NUMBER
             self.temp_dir = Path(tempfile.gettempdir()) / "beaver_calls"
             self.temp_dir.mkdir(exist_ok=True)
+
+            # Thread pool for running blocking Twilio SDK calls concurrently
+            self._executor = ThreadPoolExecutor(max_workers=32)
+
+            # HTTP session for recording downloads, created inside the running loop
+            self._http: Optional[aiohttp.ClientSession] = None
+            self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+            # Responses of already handled webhook events, for redelivered events
+            self._webhook_cache = TTLCache(maxsize=10000, ttl=86400)
+
+            # Resolved recording URLs keyed by call SID
+            self._recording_cache = TTLCache(maxsize=10000, ttl=3600)
+
+            # Outbound call throttle, created per event loop
+            self._call_sem: Optional[asyncio.Semaphore] = None
+            self._call_sem_loop: Optional[asyncio.AbstractEventLoop] = None
             
             # Call status mapping
             self.call_status = {
@@ -65,18 +123,20 @@ class TwilioService:
                 raise ValueError("Invalid phone number format")
 
             # Start call
-            call = self.client.calls.create(
-                to=to_number,
-                from_=self.phone_number,
-                url=callback_url,
-                status_callback=urljoin(callback_url, "status"),
-                status_callback_event=[
-                    "initiated", "ringing", "answered", "completed"
-                ],
-                record=True,
-                recording_status_callback=urljoin(callback_url, "recording"),
-                timeout=30
-            )
+            async with self._get_call_semaphore():
+                call = await self._run_blocking(
+                    self.client.calls.create,
+                    to=to_number,
+                    from_=self.phone_number,
+                    url=callback_url,
+                    status_callback=urljoin(callback_url, "status"),
+                    status_callback_event=[
+                        "initiated", "ringing", "answered", "completed"
+                    ],
+                    record=True,
+                    recording_status_callback=urljoin(callback_url, "recording"),
+                    timeout=30
+                )
             
             logger.info(f"Started interview call: {call.sid}")
             return True, call.sid
@@ -88,39 +148,41 @@ class TwilioService:
             logger.error(f"Error starting call: {str(e)}")
             return False, None
 
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking Twilio SDK call on the service thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            functools.partial(func, *args, **kwargs)
+        )
+
+    def _get_call_semaphore(self) -> asyncio.Semaphore:
+        """Get the outbound call semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._call_sem is None or self._call_sem_loop is not loop:
+            self._call_sem = asyncio.Semaphore(settings.TWILIO_MAX_CONCURRENT_CALLS)
+            self._call_sem_loop = loop
+        return self._call_sem
+
     def _validate_phone_number(self, phone_number: str) -> bool:
         """Validate phone number format"""
-        import re
-        pattern = r'^\+?1?\d{10,15}$'
-        return bool(re.match(pattern, phone_number))
+        return _PHONE_RE.match(phone_number) is not None
 
     def generate_interview_twiml(self,
                                message: str,
                                gather_input: bool = True,
                                timeout: int = 5) -> str:
         """Generate TwiML for interview interaction"""
-        response = VoiceResponse()
-        
-        # Add initial message
-        response.say(message, voice='alice')
-        
         if gather_input:
-            # Gather spoken input
-            gather = Gather(
-                input='speech',
-                timeout=timeout,
-                language='en-US',
-                enhanced=True,
-                speech_timeout='auto'
-            )
-            response.append(gather)
-        
-        return str(response)
+            return _INTERVIEW_TMPL.format(message=escape(message), timeout=int(timeout))
+        return _INTERVIEW_NO_GATHER_TMPL.format(message=escape(message))
 
     async def end_call(self, call_sid: str) -> bool:
         """End an active call"""
         try:
-            call = self.client.calls(call_sid).update(status='completed')
+            call = await self._run_blocking(
+                self.client.calls(call_sid).update,
+                status='completed'
+            )
             logger.info(f"Ended call: {call_sid}")
             return True
         except Exception as e:
@@ -130,64 +192,136 @@ class TwilioService:
     async def get_call_status(self, call_sid: str) -> Optional[Dict]:
         """Get current call status and details"""
         try:
-            call = self.client.calls(call_sid).fetch()
-            return {
-                'status': self.call_status.get(call.status, call.status),
-                'duration': call.duration,
-                'start_time': call.start_time,
-                'end_time': call.end_time,
-                'price': call.price,
-                'direction': call.direction
-            }
+            call = await self._run_blocking(self.client.calls(call_sid).fetch)
+            return self._to_status_dict(call)
         except Exception as e:
             logger.error(f"Failed to get call status: {str(e)}")
             return None
 
+    async def get_call_statuses(self, call_sids: List[str]) -> Dict[str, Dict]:
+        """
+        Get status details for several calls concurrently
+        
+        Args:
+            call_sids: Call SIDs to look up
+            
+        Returns:
+            Status details keyed by call SID; failed lookups are omitted
+        """
+        sids = list(dict.fromkeys(call_sids))
+        results = await asyncio.gather(
+            *(self._run_blocking(self.client.calls(sid).fetch) for sid in sids),
+            return_exceptions=True
+        )
+
+        statuses = {}
+        for sid, call in zip(sids, results):
+            if isinstance(call, Exception):
+                logger.error(f"Failed to get call status for {sid}: {str(call)}")
+                continue
+            statuses[sid] = self._to_status_dict(call)
+        return statuses
+
+    def _to_status_dict(self, call) -> Dict:
+        """Build the status details returned for a fetched call"""
+        return {
+            'status': self.call_status.get(call.status, call.status),
+            'duration': call.duration,
+            'start_time': call.start_time,
+            'end_time': call.end_time,
+            'price': call.price,
+            'direction': call.direction
+        }
+
     async def get_recording_url(self, call_sid: str) -> Optional[str]:
         """Get recording URL for a completed call"""
         try:
-            recordings = self.client.recordings.list(call_sid=call_sid)
+            if call_sid in self._recording_cache:
+                return self._recording_cache[call_sid]
+
+            recordings = await self._run_blocking(
+                self.client.recordings.list,
+                call_sid=call_sid,
+                page_size=1,
+                limit=1
+            )
             if recordings:
                 recording = recordings[0]
-                return f"https://api.twilio.com{recording.uri}.mp3"
+                url = f"https://api.twilio.com{recording.uri}.mp3"
+                self._recording_cache[call_sid] = url
+                return url
             return None
         except Exception as e:
             logger.error(f"Failed to get recording URL: {str(e)}")
             return None
 
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the authenticated HTTP session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.closed or self._http_loop is not loop:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75),
+                auth=self._basic_auth
+            )
+            self._http_loop = loop
+        return self._http
+
     async def download_recording(self,
                                recording_url: str,
                                output_path: str) -> bool:
         """Download call recording"""
         try:
-            import requests
-            
-            # Add authentication to URL
-            auth = base64.b64encode(
-                f"{settings.TWILIO_ACCOUNT_SID.get_secret_value()}:"
-                f"{settings.TWILIO_AUTH_TOKEN.get_secret_value()}".encode()
-            ).decode()
-            
-            headers = {'Authorization': f'Basic {auth}'}
-            
-            # Download recording
-            response = requests.get(recording_url, headers=headers)
-            response.raise_for_status()
-            
-            # Save to file
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+            session = self._get_http_session()
+
+            # Only a local copy needs the remote size, to skip or resume it
+            existing = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+            expected = 0
+            if existing:
+                try:
+                    async with session.head(recording_url, allow_redirects=True) as head:
+                        if head.status == 200:
+                            expected = int(head.headers.get('Content-Length', 0))
+                except aiohttp.ClientError as e:
+                    logger.warning(f"Recording size check failed, downloading in full: {str(e)}")
+
+            # Skip the transfer when a complete copy is already on disk
+            if expected > 0 and existing == expected:
+                return True
+
+            # Resume a partial file with a Range request
+            headers = {}
+            if 0 < existing < expected:
+                headers['Range'] = f'bytes={existing}-'
+
+            # Stream recording to disk in fixed-size chunks
+            async with session.get(recording_url, headers=headers) as response:
+                response.raise_for_status()
+                mode = 'ab' if response.status == 206 else 'wb'
+                async with aiofiles.open(output_path, mode) as f:
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        await f.write(chunk)
                 
             return True
         except Exception as e:
             logger.error(f"Failed to download recording: {str(e)}")
             return False
 
+    async def aclose(self):
+        """Close the HTTP session used for recording downloads"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+
     async def handle_webhook(self, data: Dict) -> Dict:
         """Handle Twilio webhook events"""
         try:
             event_type = data.get('EventType')
             call_sid = data.get('CallSid')
+
+            # Twilio may redeliver events; replay the stored response
+            cache_key = (call_sid, event_type, data.get('SequenceNumber', ''))
+            if cache_key in self._webhook_cache:
+                return self._webhook_cache[cache_key]
             
             response = {
                 'success': True,
@@ -201,6 +335,7 @@ class TwilioService:
                 if recording_url:
                     response['recording_url'] = recording_url
             
+            self._webhook_cache[cache_key] = response
             return response
             
         except Exception as e:
@@ -214,7 +349,8 @@ class TwilioService:
         """Monitor call quality metrics"""
         try:
             # Get call quality metrics
-            metrics = self.client.calls(call_sid).feedback.create(
+            metrics = await self._run_blocking(
+                self.client.calls(call_sid).feedback.create,
                 quality_score=None,
                 issue=['audio-latency', 'choppy-audio', 'dropped-call']
             )
@@ -227,28 +363,39 @@ class TwilioService:
             logger.error(f"Failed to monitor call quality: {str(e)}")
             return {}
 
-    def create_conference_call(self,
-                             participants: List[str],
-                             moderator_number: str) -> Tuple[bool, Optional[str]]:
+    async def create_conference_call(self,
+                                   participants: List[str],
+                                   moderator_number: str) -> Tuple[bool, Optional[str]]:
         """Create a conference call for multiple participants"""
         try:
             # Create conference room
-            room_name = f"interview_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+            room_name = f"interview_{uuid.uuid4().hex[:12]}"
+
+            # TwiML only depends on the room and moderator flag
+            moderator_twiml = self._generate_conference_twiml(room_name, is_moderator=True)
+            participant_twiml = self._generate_conference_twiml(room_name)
+
+            async def _dial(number: str, twiml: str):
+                async with self._get_call_semaphore():
+                    return await self._run_blocking(
+                        self.client.calls.create,
+                        to=number,
+                        from_=self.phone_number,
+                        twiml=twiml
+                    )
             
-            # Add moderator
-            moderator_call = self.client.calls.create(
-                to=moderator_number,
-                from_=self.phone_number,
-                twiml=self._generate_conference_twiml(room_name, is_moderator=True)
+            # Dial moderator and participants concurrently
+            moderator_call, *participant_calls = await asyncio.gather(
+                _dial(moderator_number, moderator_twiml),
+                *(_dial(participant, participant_twiml) for participant in participants),
+                return_exceptions=True
             )
-            
-            # Add participants
-            for participant in participants:
-                self.client.calls.create(
-                    to=participant,
-                    from_=self.phone_number,
-                    twiml=self._generate_conference_twiml(room_name)
-                )
+
+            if isinstance(moderator_call, Exception):
+                raise moderator_call
+            for participant, result in zip(participants, participant_calls):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to dial participant {participant}: {str(result)}")
             
             return True, moderator_call.sid
             
@@ -260,18 +407,10 @@ class TwilioService:
                                  room_name: str,
                                  is_moderator: bool = False) -> str:
         """Generate TwiML for conference calls"""
-        response = VoiceResponse()
-        dial = response.dial()
-        
-        conference = dial.conference(
-            room_name,
-            start_conference_on_enter=is_moderator,
-            end_conference_on_exit=is_moderator,
-            record='record-from-start',
-            recording_status_callback='/recording/callback'
+        return _CONFERENCE_TMPL.format(
+            room=escape(room_name),
+            moderator='true' if is_moderator else 'false'
         )
-        
-        return str(response)
 
 # Usage example
 if __name__ == "__main__":
@@ -6,20 +6,61 @@ import subprocess
 import logging
 from pathlib import Path
 import json
-import psycopg2
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from importlib.metadata import distributions
 from dotenv import load_dotenv
-import streamlit as st
-import google.cloud.storage
-from twilio.rest import Client
-import stripe
-from google.cloud import speech
-import firebase_admin
-import edge_tts
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Template written to .env on first run
+_ENV_TEMPLATE = """DEBUG=False
+APP_NAME="Beaver Job Interview Trainer"
+APP_URL="http://localhost:8501"
+
+# Database
+DB_HOST=localhost
+DB_PORT=5432
+DB_NAME=beaver_db
+DB_USER=your_db_user
+DB_PASSWORD=your_db_password
+
+# Google Cloud
+GOOGLE_CLOUD_PROJECT=your-project-id
+GOOGLE_APPLICATION_CREDENTIALS=path/to/credentials.json
+
+# Twilio
+TWILIO_ACCOUNT_SID=your_account_sid
+TWILIO_AUTH_TOKEN=your_auth_token
+TWILIO_PHONE_NUMBER=your_phone_number
+
+# Stripe
+STRIPE_SECRET_KEY=your_stripe_secret_key
+STRIPE_PUBLISHABLE_KEY=your_stripe_publishable_key
+STRIPE_WEBHOOK_SECRET=your_webhook_secret
+
+# Email
+SMTP_HOST=smtp.gmail.com
+SMTP_PORT=587
+SMTP_USER=your_email@gmail.com
+SMTP_PASSWORD=your_email_password
+SENDER_EMAIL=noreply@beaverinterviews.com
+SENDER_NAME="Beaver Interviews"
+
+# Firebase
+FIREBASE_CREDENTIALS_PATH=path/to/firebase-credentials.json
+
+# Storage
+BUCKET_NAME=your-storage-bucket"""
+
 class SetupManager:
+    # Connection pool opened by the database probe, shared with later probes
+    db_pool = None
+
+    # Google Cloud clients authenticated by the Google Cloud probe
+    storage_client = None
+    speech_client = None
+
     def __init__(self):
         """Initialize setup manager"""
         self.env_path = Path(".env")
@@ -44,23 +85,8 @@ class SetupManager:
             # Check dependencies
             self._check_dependencies()
             
-            # Test database connection
-            self._test_database()
-            
-            # Test Google Cloud connection
-            self._test_google_cloud()
-            
-            # Test Twilio connection
-            self._test_twilio()
-            
-            # Test Stripe connection
-            self._test_stripe()
-            
-            # Test Edge TTS
-            self._test_edge_tts()
-            
-            # Test Firebase
-            self._test_firebase()
+            # Test service connections concurrently
+            self._run_service_tests()
             
             print("\nâœ… Setup completed successfully!")
             return True
@@ -70,12 +96,32 @@ class SetupManager:
             print(f"\nâŒ Setup failed: {str(e)}")
             return False
 
+    def _run_service_tests(self):
+        """Run the independent service probes in parallel, failing on the first error"""
+        tests = [
+            self._test_database,
+            self._test_google_cloud,
+            self._test_twilio,
+            self._test_stripe,
+            self._test_edge_tts,
+            self._test_firebase
+        ]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(test) for test in tests]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+
     def _create_directories(self):
         """Create required directories"""
         print("\nCreating required directories...")
         for dir_path in self.required_dirs:
-            Path(dir_path).mkdir(parents=True, exist_ok=True)
-            print(f"âœ“ Created {dir_path}")
+            os.makedirs(dir_path, mode=0o755, exist_ok=True)
+        print(f"âœ“ Created {', '.join(self.required_dirs)}")
 
     def _check_env_file(self):
         """Check and create .env file if needed"""
@@ -83,48 +129,7 @@ class SetupManager:
         
         if not self.env_path.exists():
             print("Creating .env file...")
-            env_template = """
-DEBUG=False
-APP_NAME="Beaver Job Interview Trainer"
-APP_URL="http://localhost:8501"
-
-# Database
-DB_HOST=localhost
-DB_PORT=5432
-DB_NAME=beaver_db
-DB_USER=your_db_user
-DB_PASSWORD=your_db_password
-
-# Google Cloud
-GOOGLE_CLOUD_PROJECT=your-project-id
-GOOGLE_APPLICATION_CREDENTIALS=path/to/credentials.json
-
-# Twilio
-TWILIO_ACCOUNT_SID=your_account_sid
-TWILIO_AUTH_TOKEN=your_auth_token
-TWILIO_PHONE_NUMBER=your_phone_number
-
-# Stripe
-STRIPE_SECRET_KEY=your_stripe_secret_key
-STRIPE_PUBLISHABLE_KEY=your_stripe_publishable_key
-STRIPE_WEBHOOK_SECRET=your_webhook_secret
-
-# Email
-SMTP_HOST=smtp.gmail.com
-SMTP_PORT=587
-SMTP_USER=your_email@gmail.com
-SMTP_PASSWORD=your_email_password
-SENDER_EMAIL=noreply@beaverinterviews.com
-SENDER_NAME="Beaver Interviews"
-
-# Firebase
-FIREBASE_CREDENTIALS_PATH=path/to/firebase-credentials.json
-
-# Storage
-BUCKET_NAME=your-storage-bucket
-            """
-            with open(self.env_path, 'w') as f:
-                f.write(env_template.strip())
+            self.env_path.write_text(_ENV_TEMPLATE, encoding='utf-8')
             print("Created .env file. Please fill in your credentials.")
             sys.exit(1)
         
@@ -151,11 +156,17 @@ BUCKET_NAME=your-storage-bucket
             'python-dotenv'
         ]
         
+        # Scan installed distributions once instead of importing each package
+        installed = {
+            dist.metadata['Name'].lower().replace('_', '-')
+            for dist in distributions()
+            if dist.metadata['Name']
+        }
+        
         for package in required_packages:
-            try:
-                __import__(package.replace('-', '_'))
+            if package.lower() in installed:
                 print(f"âœ“ {package} installed")
-            except ImportError:
+            else:
                 print(f"âœ— {package} not installed")
                 if input(f"Install {package}? (y/n): ").lower() == 'y':
                     subprocess.check_call([sys.executable, "-m", "pip", "install", package])
@@ -164,14 +175,21 @@ BUCKET_NAME=your-storage-bucket
         """Test database connection"""
         print("\nTesting database connection...")
         try:
-            conn = psycopg2.connect(
-                host=os.getenv('DB_HOST'),
-                port=os.getenv('DB_PORT'),
-                dbname=os.getenv('DB_NAME'),
-                user=os.getenv('DB_USER'),
-                password=os.getenv('DB_PASSWORD')
-            )
-            conn.close()
+            from psycopg2 import pool
+
+            # Keep the verified connection pooled for later setup probes
+            if SetupManager.db_pool is None:
+                SetupManager.db_pool = pool.ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=10,
+                    host=os.getenv('DB_HOST'),
+                    port=os.getenv('DB_PORT'),
+                    dbname=os.getenv('DB_NAME'),
+                    user=os.getenv('DB_USER'),
+                    password=os.getenv('DB_PASSWORD')
+                )
+            conn = SetupManager.db_pool.getconn()
+            SetupManager.db_pool.putconn(conn)
             print("âœ“ Database connection successful")
         except Exception as e:
             print(f"âœ— Database connection failed: {str(e)}")
@@ -181,23 +199,38 @@ BUCKET_NAME=your-storage-bucket
         """Test Google Cloud connection"""
         print("\nTesting Google Cloud connection...")
         try:
+            from google.cloud import storage, speech
+
             # Test Storage
-            storage_client = google.cloud.storage.Client()
-            storage_client.list_buckets(max_results=1)
+            if SetupManager.storage_client is None:
+                SetupManager.storage_client = storage.Client()
+            SetupManager.storage_client.list_buckets(max_results=1)
             print("âœ“ Google Cloud Storage connection successful")
             
             # Test Speech-to-Text
-            speech_client = speech.SpeechClient()
+            if SetupManager.speech_client is None:
+                SetupManager.speech_client = speech.SpeechClient()
             print("âœ“ Google Cloud Speech-to-Text connection successful")
             
         except Exception as e:
             print(f"âœ— Google Cloud connection failed: {str(e)}")
             raise
 
+    @classmethod
+    def get_storage_client(cls):
+        """Get the Storage client created during setup"""
+        return cls.storage_client
+
+    @classmethod
+    def get_speech_client(cls):
+        """Get the Speech-to-Text client created during setup"""
+        return cls.speech_client
+
     def _test_twilio(self):
         """Test Twilio connection"""
         print("\nTesting Twilio connection...")
         try:
+            from twilio.rest import Client
             client = Client(
                 os.getenv('TWILIO_ACCOUNT_SID'),
                 os.getenv('TWILIO_AUTH_TOKEN')
@@ -212,6 +245,7 @@ BUCKET_NAME=your-storage-bucket
         """Test Stripe connection"""
         print("\nTesting Stripe connection...")
         try:
+            import stripe
             stripe.api_key = os.getenv('STRIPE_SECRET_KEY')
             stripe.Account.retrieve()
             print("âœ“ Stripe connection successful")
@@ -233,6 +267,8 @@ BUCKET_NAME=your-storage-bucket
         """Test Firebase connection"""
         print("\nTesting Firebase connection...")
         try:
+            import firebase_admin
+            import firebase_admin.credentials
             cred_path = os.getenv('FIREBASE_CREDENTIALS_PATH')
             if not firebase_admin._apps:
                 cred = firebase_admin.credentials.Certificate(cred_path)
@@ -2,6 +2,8 @@
 
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
+import streamlit as st
 from typing import Dict, List, Optional, Union, Any
 import pandas as pd
 import numpy as np
@@ -9,9 +11,99 @@ from datetime import datetime, timedelta
 import logging
 from plotly.subplots import make_subplots
 import colorsys
+import hashlib
+from cachetools import LRUCache
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Number of serialized figures kept by the JSON cache
+CHART_JSON_CACHE_SIZE = 128
+
+# Largest heatmap, in cells, that still gets per-cell text labels
+HEATMAP_TEXT_MAX_CELLS = 400
+
+# Default number of points kept per line trace
+MAX_LINE_POINTS = 2000
+
+# Line traces with more points than this are drawn with WebGL
+WEBGL_POINT_THRESHOLD = 5000
+
+def _col(data: pd.DataFrame, name: str) -> np.ndarray:
+    """Get a column as an ndarray, without copying where pandas allows"""
+    return data[name].to_numpy(copy=False)
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select point indices with Largest-Triangle-Three-Buckets downsampling
+    
+    Args:
+        x: Numeric x values in plotting order
+        y: Numeric y values
+        n_out: Number of points to keep
+        
+    Returns:
+        Sorted indices of the retained points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are always kept; the rest is split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Keep the point forming the largest triangle with its neighbours
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        indices[i + 1] = prev
+
+    return indices
+
+@lru_cache(maxsize=256)
+def _hue_palette(hue: float, sat: float, val: float, n_colors: int) -> tuple:
+    """
+    Build n_colors hex colors evenly spaced in hue from an HSV base
+    
+    Args:
+        hue: Base hue in [0, 1)
+        sat: Saturation shared by every color
+        val: Value shared by every color
+        n_colors: Number of colors to generate
+        
+    Returns:
+        Tuple of hex color strings
+    """
+    hues = (hue + np.arange(n_colors) / n_colors) % 1.0
+
+    # Vectorized colorsys.hsv_to_rgb over all hues at once
+    sector = np.floor(hues * 6.0)
+    f = hues * 6.0 - sector
+    sector = sector.astype(np.int64) % 6
+    p = np.full(n_colors, val * (1.0 - sat))
+    q = val * (1.0 - sat * f)
+    t = val * (1.0 - sat * (1.0 - f))
+    v = np.full(n_colors, val)
+
+    cases = [sector == k for k in range(6)]
+    r = np.select(cases, [v, q, p, p, t, v])
+    g = np.select(cases, [t, v, v, q, p, p])
+    b = np.select(cases, [p, p, t, v, v, q])
+
+    rgb = (np.stack([r, g, b], axis=1) * 255).astype(np.uint8)
+    return tuple(f'#{r:02x}{g:02x}{b:02x}' for r, g, b in rgb.tolist())
+
 class ChartHelpers:
     def __init__(self):
         """Initialize chart helpers"""
@@ -43,6 +135,15 @@ class ChartHelpers:
             }
         }
         
+        # HSV of each scheme's main color, used to derive palettes
+        self.scheme_hsv = {
+            name: colorsys.rgb_to_hsv(*self._hex_to_rgb(scheme['main']))
+            for name, scheme in self.color_schemes.items()
+        }
+        
+        # Color lookup table filled on first use, keyed by (scheme, total)
+        self._scheme_palettes: Dict[tuple, tuple] = {}
+        
         # Chart templates
         self.templates = {
             'default': {
@@ -75,6 +176,19 @@ class ChartHelpers:
                 }
             }
         }
+        
+        # Template layouts with axis styling merged in, applied in one pass
+        self._merged_layouts = {
+            name: {
+                **template['layout'],
+                'xaxis': template['axes'],
+                'yaxis': template['axes']
+            }
+            for name, template in self.templates.items()
+        }
+        
+        # Serialized figures keyed by chart type, data digest and options
+        self._json_cache = LRUCache(maxsize=CHART_JSON_CACHE_SIZE)
 
     def create_line_chart(self,
                          data: pd.DataFrame,
@@ -84,10 +198,11 @@ class ChartHelpers:
                          template: str = "default",
                          color_scheme: str = "primary",
                          show_points: bool = True,
-                         annotations: Optional[List[Dict]] = None) -> go.Figure:
-        """Create a line chart"""
+                         annotations: Optional[List[Dict]] = None,
+                         max_points: int = MAX_LINE_POINTS) -> go.Figure:
+        """Create a line chart, downsampling long series to max_points"""
         try:
-            fig = go.Figure()
+            fig = go.Figure(layout=self._layout(template))
             
             # Convert y_columns to list if string
             if isinstance(y_columns, str):
@@ -96,18 +211,20 @@ class ChartHelpers:
             # Add traces for each y column
             for i, y_col in enumerate(y_columns):
                 color = self._get_color_from_scheme(color_scheme, i, len(y_columns))
+                x_values, y_values = self._downsample_series(
+                    data, x_column, y_col, max_points
+                )
                 
-                fig.add_trace(go.Scatter(
-                    x=data[x_column],
-                    y=data[y_col],
+                trace = go.Scattergl if len(x_values) > WEBGL_POINT_THRESHOLD else go.Scatter
+                
+                fig.add_trace(trace(
+                    x=self._downcast(x_values),
+                    y=self._downcast(y_values),
                     name=y_col,
                     line=dict(color=color, width=2),
                     mode='lines+markers' if show_points else 'lines'
                 ))
             
-            # Apply template
-            self._apply_template(fig, template)
-            
             # Add title
             if title:
                 fig.update_layout(title=title)
@@ -122,6 +239,42 @@ class ChartHelpers:
             logger.error(f"Error creating line chart: {str(e)}")
             raise
 
+    def create_line_chart_json(self, data: pd.DataFrame, **kwargs) -> str:
+        """Create a line chart and return its cached Plotly JSON"""
+        return self.create_chart_json('line', data, **kwargs)
+
+    def create_chart_json(self, chart_type: str, data: pd.DataFrame, **kwargs) -> str:
+        """
+        Build a chart and return its Plotly JSON, reusing earlier results
+        
+        Args:
+            chart_type: Chart name, e.g. 'line' for create_line_chart
+            data: Chart data
+            **kwargs: Remaining arguments of the create_* method
+            
+        Returns:
+            Figure JSON, usable with st.plotly_chart(json.loads(...))
+        """
+        data_digest = hashlib.sha1(
+            pd.util.hash_pandas_object(data, index=True).values.tobytes()
+        ).hexdigest()
+        cache_key = (
+            chart_type,
+            data_digest,
+            tuple(data.columns),
+            repr(sorted(kwargs.items()))
+        )
+        
+        cached = self._json_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        create = getattr(self, f'create_{chart_type}_chart')
+        fig = create(data, **kwargs)
+        fig_json = pio.to_json(fig, validate=False, engine='orjson')
+        self._json_cache[cache_key] = fig_json
+        return fig_json
+
     def create_bar_chart(self,
                         data: pd.DataFrame,
                         x_column: str,
@@ -134,19 +287,21 @@ class ChartHelpers:
         """Create a bar chart"""
         try:
             color = self.color_schemes[color_scheme]['main']
+            x_values = _col(data, x_column)
+            y_values = _col(data, y_column)
+            x_plot = self._downcast(x_values)
+            y_plot = self._downcast(y_values)
             
             fig = go.Figure(data=[
                 go.Bar(
-                    x=data[x_column] if orientation == "v" else data[y_column],
-                    y=data[y_column] if orientation == "v" else data[x_column],
+                    x=x_plot if orientation == "v" else y_plot,
+                    y=y_plot if orientation == "v" else x_plot,
                     orientation=orientation,
                     marker_color=color,
-                    text=data[y_column] if show_values else None,
+                    text=y_values if show_values else None,
                     textposition='auto'
                 )
-            ])
-            
-            self._apply_template(fig, template)
+            ], layout=self._layout(template))
             
             if title:
                 fig.update_layout(title=title)
@@ -174,14 +329,12 @@ class ChartHelpers:
             
             fig = go.Figure(data=[
                 go.Pie(
-                    values=data[values_column],
-                    labels=data[names_column],
+                    values=self._downcast(_col(data, values_column)),
+                    labels=_col(data, names_column),
                     hole=hole,
                     marker_colors=colors
                 )
-            ])
-            
-            self._apply_template(fig, template)
+            ], layout=self._layout(template))
             
             if title:
                 fig.update_layout(title=title)
@@ -203,8 +356,14 @@ class ChartHelpers:
                           color_scheme: str = "primary") -> go.Figure:
         """Create a scatter plot"""
         try:
+            # Narrow the plotted coordinates before px copies them into traces
+            plot_data = data.assign(**{
+                column: self._downcast(_col(data, column))
+                for column in (x_column, y_column)
+            })
+            
             fig = px.scatter(
-                data,
+                plot_data,
                 x=x_column,
                 y=y_column,
                 size=size_column,
@@ -229,20 +388,26 @@ class ChartHelpers:
                       template: str = "default",
                       color_scheme: str = "primary",
                       show_values: bool = True) -> go.Figure:
-        """Create a heatmap"""
+        """Create a heatmap; cell labels are dropped for large grids"""
         try:
+            z = data.to_numpy(dtype=np.float32)
+            
+            # Pre-format labels server-side, only while the grid is small
+            text = None
+            if show_values and z.size <= HEATMAP_TEXT_MAX_CELLS:
+                text = np.char.mod('%.2f', z)
+            
             fig = go.Figure(data=go.Heatmap(
-                z=data.values,
+                z=z,
                 x=data.columns,
                 y=data.index,
                 colorscale=self.color_schemes[color_scheme]['gradient'],
-                text=data.values if show_values else None,
-                texttemplate="%{text}" if show_values else None,
+                text=text,
+                texttemplate="%{text}" if text is not None else None,
                 textfont={"size": 10},
+                hovertemplate="%{y}, %{x}: %{z:.2f}<extra></extra>",
                 hoverongaps=False
-            ))
-            
-            self._apply_template(fig, template)
+            ), layout=self._layout(template))
             
             if title:
                 fig.update_layout(title=title)
@@ -266,7 +431,7 @@ class ChartHelpers:
                 theta=categories,
                 fill='toself',
                 line_color=self.color_schemes[color_scheme]['main']
-            ))
+            ), layout=self._layout(template))
             
             fig.update_layout(
                 polar=dict(
@@ -278,8 +443,6 @@ class ChartHelpers:
                 showlegend=False
             )
             
-            self._apply_template(fig, template)
-            
             if title:
                 fig.update_layout(title=title)
             
@@ -303,14 +466,10 @@ class ChartHelpers:
                     x=values,
                     textinfo="value+percent initial",
                     marker=dict(
-                        color=[self._get_color_from_scheme(
-                            color_scheme, i, len(stages)
-                        ) for i in range(len(stages))]
+                        color=list(self._scheme_palette(color_scheme, len(stages)))
                     )
                 )
-            ])
-            
-            self._apply_template(fig, template)
+            ], layout=self._layout(template))
             
             if title:
                 fig.update_layout(title=title)
@@ -342,9 +501,7 @@ class ChartHelpers:
                          'color': self.color_schemes[color_scheme]['light']}
                     ]
                 }
-            ))
-            
-            self._apply_template(fig, template)
+            ), layout=self._layout(template))
             
             if title:
                 fig.update_layout(title=title)
@@ -355,41 +512,78 @@ class ChartHelpers:
             logger.error(f"Error creating gauge chart: {str(e)}")
             raise
 
+    @staticmethod
+    def _downcast(values: np.ndarray) -> np.ndarray:
+        """Narrow numeric chart values to the smallest dtype that holds them"""
+        if values.size == 0:
+            return values
+        if values.dtype == np.float64:
+            if np.nanmax(np.abs(values), initial=0.0) < 1e30:
+                return values.astype(np.float32, copy=False)
+        elif np.issubdtype(values.dtype, np.integer):
+            narrow = np.result_type(
+                np.min_scalar_type(values.min()),
+                np.min_scalar_type(values.max())
+            )
+            return values.astype(narrow, copy=False)
+        return values
+
+    @staticmethod
+    def _downsample_series(data: pd.DataFrame,
+                           x_column: str,
+                           y_column: str,
+                           max_points: int) -> tuple:
+        """Reduce an x/y series to at most max_points with LTTB"""
+        x_values = _col(data, x_column)
+        y_values = _col(data, y_column)
+        if len(data) <= max_points:
+            return x_values, y_values
+
+        # LTTB needs numeric x; datetimes map to ns, categories to position
+        if np.issubdtype(x_values.dtype, np.datetime64):
+            x_numeric = x_values.astype('datetime64[ns]').view(np.int64).astype(np.float64)
+        elif np.issubdtype(x_values.dtype, np.number):
+            x_numeric = x_values.astype(np.float64)
+        else:
+            x_numeric = np.arange(len(x_values), dtype=np.float64)
+
+        keep = _lttb_indices(x_numeric, y_values.astype(np.float64), max_points)
+        return x_values[keep], y_values[keep]
+
+    def _layout(self, template_name: str) -> Dict:
+        """Get the merged layout for a template"""
+        return self._merged_layouts.get(template_name, self._merged_layouts['default'])
+
     def _apply_template(self, fig: go.Figure, template_name: str):
-        """Apply template to figure"""
-        template = self.templates.get(template_name, self.templates['default'])
-        
-        fig.update_layout(**template['layout'])
-        fig.update_xaxes(**template['axes'])
-        fig.update_yaxes(**template['axes'])
+        """Apply template to an already built figure"""
+        fig.update_layout(self._layout(template_name))
 
     def _get_color_from_scheme(self, 
                              scheme: str, 
                              index: int, 
                              total: int) -> str:
         """Get color from scheme based on index"""
-        base_color = self.color_schemes[scheme]['main']
-        if total == 1:
-            return base_color
-            
-        hue, sat, val = colorsys.rgb_to_hsv(*self._hex_to_rgb(base_color))
-        new_hue = (hue + (index / total)) % 1.0
-        rgb = colorsys.hsv_to_rgb(new_hue, sat, val)
-        return self._rgb_to_hex(rgb)
+        return self._scheme_palette(scheme, total)[index]
+
+    def _scheme_palette(self, scheme: str, total: int) -> tuple:
+        """Get the colors for a scheme split into total entries"""
+        palette = self._scheme_palettes.get((scheme, total))
+        if palette is None:
+            if total == 1:
+                palette = (self.color_schemes[scheme]['main'],)
+            else:
+                palette = _hue_palette(*self.scheme_hsv[scheme], total)
+            self._scheme_palettes[(scheme, total)] = palette
+        return palette
 
     def _generate_color_palette(self, 
                               n_colors: int, 
                               base_color: str) -> List[str]:
         """Generate color palette based on base color"""
-        palette = []
+        if n_colors <= 0:
+            return []
         hue, sat, val = colorsys.rgb_to_hsv(*self._hex_to_rgb(base_color))
-        
-        for i in range(n_colors):
-            new_hue = (hue + (i / n_colors)) % 1.0
-            rgb = colorsys.hsv_to_rgb(new_hue, sat, val)
-            palette.append(self._rgb_to_hex(rgb))
-            
-        return palette
+        return list(_hue_palette(hue, sat, val, n_colors))
 
     @staticmethod
     def _hex_to_rgb(hex_color: str) -> tuple:
@@ -409,6 +603,30 @@ class ChartHelpers:
 # Initialize chart helpers
 chart_helpers = ChartHelpers()
 
+# Streamlit result cache lifetime for chart JSON, in seconds
+CHART_CACHE_TTL = 3600
+
+def _hash_dataframe(data: pd.DataFrame) -> str:
+    """Hash every row of a DataFrame for the Streamlit cache"""
+    return hashlib.md5(
+        pd.util.hash_pandas_object(data, index=True).values.tobytes()
+    ).hexdigest()
+
+@st.cache_data(ttl=CHART_CACHE_TTL, hash_funcs={pd.DataFrame: _hash_dataframe})
+def cached_line_chart(data: pd.DataFrame, **kwargs) -> str:
+    """Line chart JSON cached across Streamlit reruns; load with pio.from_json"""
+    return chart_helpers.create_chart_json('line', data, **kwargs)
+
+@st.cache_data(ttl=CHART_CACHE_TTL, hash_funcs={pd.DataFrame: _hash_dataframe})
+def cached_bar_chart(data: pd.DataFrame, **kwargs) -> str:
+    """Bar chart JSON cached across Streamlit reruns; load with pio.from_json"""
+    return chart_helpers.create_chart_json('bar', data, **kwargs)
+
+@st.cache_data(ttl=CHART_CACHE_TTL, hash_funcs={pd.DataFrame: _hash_dataframe})
+def cached_pie_chart(data: pd.DataFrame, **kwargs) -> str:
+    """Pie chart JSON cached across Streamlit reruns; load with pio.from_json"""
+    return chart_helpers.create_chart_json('pie', data, **kwargs)
+
 if __name__ == "__main__":
     # Test chart generation
     test_data = pd.DataFrame({
@@ -443,7 +661,6 @@ if __name__ == "__main__":
     )
     
     # Display charts (if running in Streamlit)
-    import streamlit as st
     st.plotly_chart(line_chart)
     st.plotly_chart(bar_chart)
     st.plotly_chart(pie_chart)
\ No newline at end of file
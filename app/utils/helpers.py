@@ -1,43 +1,145 @@
 # app/utils/helpers.py
 
 import streamlit as st
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Tuple
 from datetime import datetime, timedelta
 import jwt
+import calendar
 import hashlib
+import hmac
+import mmap
+import os
 import re
-import json
+import orjson
 import base64
 from pathlib import Path
 import tempfile
 import logging
+import numpy as np
 import pandas as pd
+from numba import njit
 import plotly.graph_objects as go
 from email_validator import validate_email, EmailNotValidError
 import pytz
+from functools import lru_cache
 from urllib.parse import urlparse
-import requests
+import asyncio
+import httpx
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# JWT signing key, encoded once instead of on every sign/verify
+_JWT_KEY = settings.JWT_SECRET.get_secret_value().encode()
+
+# Payloads above this size use st.download_button instead of a data: URI
+DOWNLOAD_LINK_MAX_BYTES = 1024 * 1024
+
+# Shared HTTP client for APIHelpers, recreated per event loop
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Get the pooled HTTP client for the running event loop"""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=50)
+        )
+        _async_client_loop = loop
+    return _async_client
+
+@lru_cache(maxsize=64)
+def _tz(name: str):
+    """Get a cached pytz timezone by name"""
+    return pytz.timezone(name)
+
+# orjson options for API responses; naive datetimes are emitted as UTC ISO strings
+_API_RESPONSE_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+# Units for format_file_size, one per factor of 1024
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Patterns used by ValidationHelpers
+_PHONE_RE = re.compile(r'^\+?1?\d{9,15}$')
+_TAG_RE = re.compile(r'<.*?>')
+_CHAR_RE = re.compile(r'[^a-zA-Z0-9\s\-_.,!?]')
+
+# scrypt cost parameters for password hashing
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_SALT_BYTES = 16
+SCRYPT_DKLEN = 32
+
+@njit(cache=True)
+def _mean_std(values: np.ndarray):
+    """Single-pass mean and sample standard deviation (Welford)"""
+    n = values.shape[0]
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        delta = values[i] - mean
+        mean += delta / (i + 1)
+        m2 += delta * (values[i] - mean)
+    std = (m2 / (n - 1)) ** 0.5 if n > 1 else np.nan
+    return mean if n > 0 else np.nan, std
+
 class SecurityHelpers:
     """Security-related utility functions"""
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """
+        Hash password with a random salt using scrypt
+        
+        Args:
+            password: Plain-text password
+            
+        Returns:
+            Hex-encoded salt and derived key joined by '$'
+        """
+        salt = os.urandom(SCRYPT_SALT_BYTES)
+        key = hashlib.scrypt(
+            password.encode(),
+            salt=salt,
+            n=SCRYPT_N,
+            r=SCRYPT_R,
+            p=SCRYPT_P,
+            dklen=SCRYPT_DKLEN
+        )
+        return f"{salt.hex()}${key.hex()}"
+
+    @staticmethod
+    def verify_password(password: str, password_hash: str) -> bool:
+        """Check a password against a hash from hash_password"""
+        try:
+            salt_hex, key_hex = password_hash.split('$', 1)
+            key = hashlib.scrypt(
+                password.encode(),
+                salt=bytes.fromhex(salt_hex),
+                n=SCRYPT_N,
+                r=SCRYPT_R,
+                p=SCRYPT_P,
+                dklen=SCRYPT_DKLEN
+            )
+            return hmac.compare_digest(key, bytes.fromhex(key_hex))
+        except ValueError:
+            return False
     
     @staticmethod
     def generate_token(data: Dict, expiry_hours: int = 24) -> str:
         """Generate JWT token"""
         try:
+            expires = datetime.utcnow() + timedelta(hours=expiry_hours)
             payload = {
                 **data,
-                'exp': datetime.utcnow() + timedelta(hours=expiry_hours)
+                'exp': calendar.timegm(expires.utctimetuple())
             }
-            return jwt.encode(payload, settings.JWT_SECRET.get_secret_value(), algorithm='HS256')
+            # Sign pre-serialized claims to skip PyJWT's stdlib json encoding
+            return jwt.api_jws.encode(orjson.dumps(payload), _JWT_KEY, algorithm='HS256')
         except Exception as e:
             logger.error(f"Error generating token: {str(e)}")
             raise
@@ -46,7 +148,7 @@ class SecurityHelpers:
     def verify_token(token: str) -> Optional[Dict]:
         """Verify JWT token"""
         try:
-            return jwt.decode(token, settings.JWT_SECRET.get_secret_value(), algorithms=['HS256'])
+            return jwt.decode(token, _JWT_KEY, algorithms=['HS256'])
         except jwt.ExpiredSignatureError:
             logger.warning("Token expired")
             return None
@@ -69,8 +171,7 @@ class ValidationHelpers:
     @staticmethod
     def validate_phone(phone: str) -> bool:
         """Validate phone number format"""
-        pattern = r'^\+?1?\d{9,15}$'
-        return bool(re.match(pattern, phone))
+        return bool(_PHONE_RE.match(phone))
 
     @staticmethod
     def validate_url(url: str) -> bool:
@@ -84,11 +185,8 @@ class ValidationHelpers:
     @staticmethod
     def sanitize_input(text: str) -> str:
         """Sanitize user input"""
-        # Remove HTML tags
-        clean_text = re.compile('<.*?>').sub('', text)
-        # Remove special characters
-        clean_text = re.compile('[^a-zA-Z0-9\s\-_.,!?]').sub('', clean_text)
-        return clean_text.strip()
+        # Remove HTML tags, then special characters
+        return _CHAR_RE.sub('', _TAG_RE.sub('', text)).strip()
 
 class DataHelpers:
     """Data manipulation utility functions"""
@@ -109,17 +207,35 @@ class DataHelpers:
     @staticmethod
     def to_local_timezone(dt: datetime, timezone: str = "UTC") -> datetime:
         """Convert datetime to local timezone"""
-        local_tz = pytz.timezone(timezone)
-        return dt.astimezone(local_tz)
+        return dt.astimezone(_tz(timezone))
+
+    @staticmethod
+    def to_local_timezone_bulk(series: pd.Series, timezone: str = "UTC") -> pd.Series:
+        """Convert a datetime series to local timezone; naive values are taken as UTC"""
+        if series.dt.tz is None:
+            series = series.dt.tz_localize('UTC')
+        return series.dt.tz_convert(_tz(timezone))
 
     @staticmethod
     def format_file_size(size_bytes: int) -> str:
         """Format file size in human-readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.2f} TB"
+        size_bytes = int(size_bytes)
+        unit = min(max(size_bytes.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * unit)):.2f} {_SIZE_UNITS[unit]}"
+
+    @staticmethod
+    def format_file_sizes(sizes_bytes: np.ndarray) -> List[str]:
+        """Format many file sizes at once"""
+        sizes = np.asarray(sizes_bytes, dtype=np.float64)
+        units = np.zeros(sizes.shape, dtype=np.int64)
+        positive = sizes >= 1
+        units[positive] = np.floor(np.log2(sizes[positive]) / 10).astype(np.int64)
+        units = np.clip(units, 0, len(_SIZE_UNITS) - 1)
+        scaled = sizes / np.power(1024.0, units)
+        return [
+            f"{size:.2f} {_SIZE_UNITS[unit]}"
+            for size, unit in zip(scaled.tolist(), units.tolist())
+        ]
 
 class UIHelpers:
     """UI utility functions"""
@@ -158,10 +274,29 @@ class UIHelpers:
 
     @staticmethod
     def create_download_link(data: Any, filename: str, mime_type: str = "text/plain"):
-        """Create download link for data"""
+        """
+        Create download link for data
+        
+        Large payloads are rendered as a download button instead and an
+        empty string is returned.
+        """
         if isinstance(data, (dict, list)):
-            data = json.dumps(data, indent=2)
-        b64 = base64.b64encode(data.encode()).decode()
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        elif isinstance(data, str):
+            payload = data.encode()
+        else:
+            payload = bytes(data)
+        
+        if len(payload) > DOWNLOAD_LINK_MAX_BYTES:
+            st.download_button(
+                f"Download {filename}",
+                data=payload,
+                file_name=filename,
+                mime=mime_type
+            )
+            return ""
+        
+        b64 = base64.b64encode(payload).decode('ascii')
         href = f'<a href="data:{mime_type};base64,{b64}" download="{filename}">Download {filename}</a>'
         return href
 
@@ -195,14 +330,36 @@ class FileHelpers:
         return FileHelpers.get_file_extension(filename) in allowed_extensions
 
     @staticmethod
-    def read_file_chunks(file_path: str, chunk_size: int = 8192):
-        """Generator to read file in chunks"""
+    def read_file_chunks(file_path: str, chunk_size: int = 1 << 20):
+        """
+        Generator to read file in chunks
+        
+        Chunks are zero-copy views over a memory map and are only valid
+        while iterating; copy with bytes() to keep one.
+        """
         with open(file_path, 'rb') as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                yield chunk
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                view = memoryview(mm)
+                for offset in range(0, len(mm), chunk_size):
+                    yield view[offset:offset + chunk_size]
+                view.release()
+            finally:
+                try:
+                    mm.close()
+                except BufferError:
+                    # A caller still holds a chunk; the map closes once it is freed
+                    pass
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """Get the SHA-256 hex digest of a file"""
+        digest = hashlib.sha256()
+        for chunk in FileHelpers.read_file_chunks(file_path):
+            digest.update(chunk)
+        return digest.hexdigest()
 
 class APIHelpers:
     """API-related utility functions"""
@@ -211,20 +368,36 @@ class APIHelpers:
     async def make_request(url: str, method: str = "GET", **kwargs) -> Optional[Dict]:
         """Make HTTP request with error handling"""
         try:
-            response = requests.request(method, url, **kwargs)
+            response = await _get_async_client().request(method, url, **kwargs)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             logger.error(f"API request failed: {str(e)}")
             return None
 
     @staticmethod
-    def format_api_response(data: Any, success: bool = True) -> Dict:
-        """Format API response"""
+    async def aclose():
+        """Close the shared HTTP client"""
+        global _async_client
+        if _async_client is not None and not _async_client.is_closed:
+            await _async_client.aclose()
+        _async_client = None
+
+    @staticmethod
+    def format_api_response(data: Any, success: bool = True) -> bytes:
+        """Format API response serialized as JSON bytes"""
+        return orjson.dumps(
+            APIHelpers.format_api_response_dict(data, success),
+            option=_API_RESPONSE_OPTIONS
+        )
+
+    @staticmethod
+    def format_api_response_dict(data: Any, success: bool = True) -> Dict:
+        """Format API response; the timestamp is a naive UTC datetime"""
         return {
             "success": success,
             "data": data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
 
 class CacheHelpers:
@@ -248,6 +421,26 @@ class AnalyticsHelpers:
     @staticmethod
     def calculate_metrics(data: pd.DataFrame) -> Dict[str, float]:
         """Calculate common metrics from DataFrame"""
+        if data.ndim == 1 and pd.api.types.is_numeric_dtype(data):
+            # Single numeric series: fused mean/std pass plus partition median
+            values = data.to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            mean, std = _mean_std(values)
+            n = len(values)
+            if n == 0:
+                median = np.nan
+            elif n % 2:
+                median = np.partition(values, n // 2)[n // 2]
+            else:
+                lower, upper = np.partition(values, [n // 2 - 1, n // 2])[n // 2 - 1:n // 2 + 1]
+                median = (lower + upper) / 2
+            return {
+                "total": len(data),
+                "mean": mean,
+                "median": median,
+                "std": std
+            }
+
         metrics = {
             "total": len(data),
             "mean": data.mean(),
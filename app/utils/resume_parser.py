@@ -1,36 +1,147 @@
 # app/utils/resume_parser.py
 
-import PyPDF2
+import pypdfium2 as pdfium
 import docx
 import spacy
+from spacy.language import Language
+from functools import lru_cache
 import re
-from typing import Dict, List, Optional, Any
+import re2
+import asyncio
+from typing import Dict, List, Optional, Any, Union, BinaryIO, Tuple
 import logging
 from pathlib import Path
-import tempfile
+import io
 import json
+import orjson
 from datetime import datetime
 import email_validator
-from spacy.tokens import Doc
+from spacy.tokens import Doc, Span
+from spacy.matcher import PhraseMatcher
+from spacy.attrs import LOWER, IS_STOP, IS_PUNCT, IS_SPACE
+import numpy as np
+from numba import njit, prange
 import pandas as pd
-from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Job title: a seniority/field word followed by more words, or a bare role noun
+_TITLE_RE = re.compile(
+    r'\b(?:Senior|Lead|Principal|Junior|Software|Data|Product|Project|Business|Marketing|Sales|HR|Human Resources)[\s\w]+\b'
+    r'|\b(?:Engineer|Developer|Scientist|Analyst|Manager|Consultant|Designer|Architect)\b',
+    re.IGNORECASE
+)
+_DATE_RE = re2.compile(r'(?i)(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[\s\-]?\d{4}')
+_GPA_RE = re.compile(r'GPA:?\s*(\d+\.\d+)')
+_LANGUAGE_RE = re.compile(r'(English|Spanish|French|German|Chinese|Japanese|Korean|Russian|Arabic|Portuguese|Italian)[\s\-]*(Native|Fluent|Professional|Intermediate|Basic)', re.IGNORECASE)
+_CERT_RE = re.compile(r'([\w\s]+certification|certificate)[\s\-]*([\w\s]+)', re.IGNORECASE)
+
+# Section heading keywords mapped to the canonical section name
+_SECTION_KEYWORDS = {
+    'education': 'education',
+    'academic': 'education',
+    'experience': 'experience',
+    'work': 'experience',
+    'employment': 'experience',
+    'skills': 'skills',
+    'languages': 'languages',
+    'language skills': 'languages',
+    'projects': 'projects',
+    'personal projects': 'projects',
+    'certifications': 'certifications',
+    'certificates': 'certifications'
+}
+_SECTION_RE = re.compile(
+    r'^\s*(' + '|'.join(sorted(map(re.escape, _SECTION_KEYWORDS), key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+# orjson options for exported resume data
+_EXPORT_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+
+# Pipeline components whose output the extractors never read
+_UNUSED_PIPES = ("tagger", "attribute_ruler", "lemmatizer")
+
+# Line prefixes that mark bullet points
+_BULLET_PREFIXES = ('•', '-', '∙')
+
+# Number of sentences kept in the generated summary
+SUMMARY_SENTENCES = 3
+
+@njit(parallel=True, cache=True)
+def _sentence_scores(token_scores: np.ndarray,
+                     starts: np.ndarray,
+                     ends: np.ndarray) -> np.ndarray:
+    """Sum token scores over each [start, end) sentence span"""
+    out = np.zeros(starts.shape[0])
+    for j in prange(starts.shape[0]):
+        total = 0.0
+        for i in range(starts[j], ends[j]):
+            total += token_scores[i]
+        out[j] = total
+    return out
+
+# Custom pipeline components, added after NER in this order
+_CUSTOM_PIPES = ("skill_matcher", "education_extractor", "experience_extractor")
+
+@lru_cache(maxsize=1)
+def _load_nlp(model_name: str = "en_core_web_lg") -> Language:
+    """Load the SpaCy model once per process and add custom components"""
+    nlp = spacy.load(model_name)
+    
+    previous = "ner"
+    for name in _CUSTOM_PIPES:
+        if not Language.has_factory(name):
+            logger.warning(f"SpaCy component not registered, skipping: {name}")
+            continue
+        if not nlp.has_pipe(name):
+            nlp.add_pipe(name, after=previous)
+        previous = name
+    
+    return nlp
+
+@lru_cache(maxsize=8)
+def _compile_skill_patterns(nlp: Language, skills: tuple) -> tuple:
+    """
+    Compile the skill matchers once per model and skills database
+    
+    Args:
+        nlp: Loaded SpaCy pipeline
+        skills: (category, skill names) pairs
+        
+    Returns:
+        Phrase matcher, lowercase-to-canonical name map and alternation regex
+    """
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    for _, skill_list in skills:
+        for skill in skill_list:
+            matcher.add(skill, [nlp.make_doc(skill)])
+
+    # Single alternation over every skill for raw-text scans; longest
+    # names first so e.g. "JavaScript" wins over "Java"
+    names = {
+        skill.lower(): skill
+        for _, skill_list in skills
+        for skill in skill_list
+    }
+    pattern = re.compile(
+        r'(?<!\w)(?:'
+        + '|'.join(map(re.escape, sorted(names, key=len, reverse=True)))
+        + r')(?!\w)',
+        re.IGNORECASE
+    )
+    return matcher, names, pattern
+
 class ResumeParser:
     def __init__(self):
         """Initialize the resume parser"""
         try:
-            # Load SpaCy model for NER
-            self.nlp = spacy.load("en_core_web_lg")
-            
-            # Add custom pipeline components
-            self.nlp.add_pipe("skill_matcher", after="ner")
-            self.nlp.add_pipe("education_extractor", after="skill_matcher")
-            self.nlp.add_pipe("experience_extractor", after="education_extractor")
+            # Load SpaCy model for NER, shared by every parser instance
+            self.nlp = _load_nlp()
             
             # Load skills database
             self.skills_db = self._load_skills_database()
+            self._build_skill_matcher()
             
             # Compile regex patterns
             self._compile_patterns()
@@ -70,14 +181,31 @@ class ResumeParser:
             logger.error(f"Failed to load skills database: {str(e)}")
             return {}
 
+    def _build_skill_matcher(self):
+        """Attach the compiled skill patterns for this model and database"""
+        skills = tuple(
+            (category, tuple(skill_list))
+            for category, skill_list in self.skills_db.items()
+        )
+        self.skill_matcher, self._skill_names, self._skills_re = _compile_skill_patterns(
+            self.nlp, skills
+        )
+
+    def _match_skills(self, doc: Doc) -> set:
+        """Return the names of all skills mentioned in a Doc"""
+        return {
+            self.nlp.vocab.strings[match_id]
+            for match_id, _, _ in self.skill_matcher(doc)
+        }
+
     def _compile_patterns(self):
-        """Compile regex patterns for parsing"""
+        """Compile regex patterns for parsing with linear-time RE2"""
         self.patterns = {
-            'email': re.compile(r'[\w\.-]+@[\w\.-]+\.\w+'),
-            'phone': re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'),
-            'education': re.compile(r'(?i)(bachelor|master|phd|b\.?s\.?|m\.?s\.?|ph\.?d\.?)'),
-            'date': re.compile(r'(?i)(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[\s\-]?\d{4}'),
-            'url': re.compile(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[^\s]*')
+            'email': re2.compile(r'[\w\.-]+@[\w\.-]+\.\w+'),
+            'phone': re2.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'),
+            'education': re2.compile(r'(?i)(bachelor|master|phd|b\.?s\.?|m\.?s\.?|ph\.?d\.?)'),
+            'date': _DATE_RE,
+            'url': re2.compile(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[^\s]*')
         }
 
     def parse(self, file_obj: Any) -> Optional[Dict[str, Any]]:
@@ -96,72 +224,157 @@ class ResumeParser:
             if not text:
                 raise ValueError("No text could be extracted from the file")
 
-            # Process text with SpaCy
-            doc = self.nlp(text)
-
-            # Extract information
-            parsed_data = {
-                'basic_info': self._extract_basic_info(doc),
-                'contact_info': self._extract_contact_info(text),
-                'education': self._extract_education(doc),
-                'experience': self._extract_experience(doc),
-                'skills': self._extract_skills(doc),
-                'languages': self._extract_languages(doc),
-                'projects': self._extract_projects(doc),
-                'certifications': self._extract_certifications(doc),
-                'summary': self._generate_summary(doc),
-                'metadata': {
-                    'parsed_at': datetime.utcnow().isoformat(),
-                    'parser_version': '1.0.0'
-                }
-            }
-
-            # Validate parsed data
-            self._validate_parsed_data(parsed_data)
+            # Process text with SpaCy, skipping components we don't use
+            with self.nlp.select_pipes(disable=self._unused_pipes()):
+                doc = self.nlp(text)
 
-            return parsed_data
+            return self._build_parsed_data(text, doc)
 
         except Exception as e:
             logger.error(f"Failed to parse resume: {str(e)}")
             return None
 
+    def parse_many(self, 
+                   file_objs: List[Any], 
+                   batch_size: int = 32,
+                   n_process: int = 1) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse several resume files with batched SpaCy processing
+        
+        Args:
+            file_objs: File objects (PDF or DOCX)
+            batch_size: Number of texts per SpaCy batch
+            n_process: Number of SpaCy worker processes
+            
+        Returns:
+            Parsed resume information per file, None where parsing failed
+        """
+        texts = [self._safe_extract_text(file_obj) for file_obj in file_objs]
+        return self._parse_texts(texts, batch_size, n_process)
+
+    async def parse_async(self, file_obj: Any) -> Optional[Dict[str, Any]]:
+        """Parse a resume file without blocking the event loop"""
+        return await asyncio.to_thread(self.parse, file_obj)
+
+    async def parse_batch(self, 
+                          file_objs: List[Any], 
+                          batch_size: int = 32,
+                          n_process: int = 1) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse several resume files, extracting their text concurrently
+        
+        Args:
+            file_objs: File objects (PDF or DOCX)
+            batch_size: Number of texts per SpaCy batch
+            n_process: Number of SpaCy worker processes
+            
+        Returns:
+            Parsed resume information per file, None where parsing failed
+        """
+        texts = await asyncio.gather(*(
+            asyncio.to_thread(self._safe_extract_text, file_obj)
+            for file_obj in file_objs
+        ))
+        
+        # One batched model pass; the pipeline is not shared across threads
+        return await asyncio.to_thread(self._parse_texts, texts, batch_size, n_process)
+
+    def _safe_extract_text(self, file_obj: Any) -> Optional[str]:
+        """Extract resume text, logging failures instead of raising"""
+        try:
+            text = self._extract_text(file_obj)
+            if text:
+                return text
+            logger.error(f"No text could be extracted from {file_obj.name}")
+        except Exception as e:
+            logger.error(f"Failed to extract resume text: {str(e)}")
+        return None
+
+    def _parse_texts(self, 
+                     texts: List[Optional[str]], 
+                     batch_size: int,
+                     n_process: int) -> List[Optional[Dict[str, Any]]]:
+        """Run extracted texts through SpaCy in batches and build results"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        indices = [i for i, text in enumerate(texts) if text]
+        
+        with self.nlp.select_pipes(disable=self._unused_pipes()):
+            docs = self.nlp.pipe(
+                (texts[i] for i in indices), 
+                batch_size=batch_size, 
+                n_process=n_process
+            )
+            for i, doc in zip(indices, docs):
+                try:
+                    results[i] = self._build_parsed_data(texts[i], doc)
+                except Exception as e:
+                    logger.error(f"Failed to parse resume: {str(e)}")
+        
+        return results
+
+    def _unused_pipes(self) -> List[str]:
+        """Names of loaded pipeline components that parsing can skip"""
+        return [name for name in _UNUSED_PIPES if name in self.nlp.pipe_names]
+
+    def _build_parsed_data(self, text: str, doc: Doc) -> Dict[str, Any]:
+        """Extract and validate resume information from processed text"""
+        # Sentence spans and section lines are computed once and shared
+        sents = tuple(doc.sents)
+        sections = self._index_sections(text)
+        parsed_data = {
+            'basic_info': self._extract_basic_info(doc, text),
+            'contact_info': self._extract_contact_info(text),
+            'education': self._extract_education(sents, sections),
+            'experience': self._extract_experience(sents, sections),
+            'skills': self._extract_skills(doc),
+            'languages': self._extract_languages(doc, sections),
+            'projects': self._extract_projects(sents, sections),
+            'certifications': self._extract_certifications(doc, sections),
+            'summary': self._generate_summary(doc, sents),
+            'metadata': {
+                'parsed_at': datetime.utcnow().isoformat(),
+                'parser_version': '1.0.0'
+            }
+        }
+
+        # Validate parsed data
+        self._validate_parsed_data(parsed_data)
+
+        return parsed_data
+
     def _extract_text(self, file_obj: Any) -> str:
         """Extract text from resume file"""
+        # Get file extension
+        filename = file_obj.name.lower()
+        
+        # Parse straight from memory, no temporary file
+        if filename.endswith('.pdf'):
+            return self._extract_from_pdf(file_obj.read())
+        elif filename.endswith(('.docx', '.doc')):
+            return self._extract_from_docx(io.BytesIO(file_obj.read()))
+        else:
+            raise ValueError("Unsupported file format")
+
+    def _extract_from_pdf(self, source: Union[str, bytes]) -> str:
+        """Extract text from PDF file path or bytes"""
+        pdf = pdfium.PdfDocument(source)
         try:
-            # Get file extension
-            filename = file_obj.name.lower()
-            
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                temp_file.write(file_obj.read())
-                temp_path = temp_file.name
-
-            if filename.endswith('.pdf'):
-                return self._extract_from_pdf(temp_path)
-            elif filename.endswith(('.docx', '.doc')):
-                return self._extract_from_docx(temp_path)
-            else:
-                raise ValueError("Unsupported file format")
-
+            parts = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                parts.append(textpage.get_text_range() or "")
+                textpage.close()
+                page.close()
+            return "\n".join(parts)
         finally:
-            # Cleanup temporary file
-            Path(temp_path).unlink()
-
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        text = ""
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
-
-    def _extract_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
-        doc = docx.Document(file_path)
+            pdf.close()
+
+    def _extract_from_docx(self, source: Union[str, BinaryIO]) -> str:
+        """Extract text from DOCX file path or file-like object"""
+        doc = docx.Document(source)
         return "\n".join([paragraph.text for paragraph in doc.paragraphs])
 
-    def _extract_basic_info(self, doc: Doc) -> Dict[str, str]:
+    def _extract_basic_info(self, doc: Doc, text: str) -> Dict[str, str]:
         """Extract basic information from resume"""
         basic_info = {
             'name': '',
@@ -176,16 +389,9 @@ class ResumeParser:
                 break
 
         # Extract job title
-        title_patterns = [
-            r"(?i)(Senior|Lead|Principal|Junior|Software|Data|Product|Project|Business|Marketing|Sales|HR|Human Resources)[\s\w]+",
-            r"(?i)(Engineer|Developer|Scientist|Analyst|Manager|Consultant|Designer|Architect)"
-        ]
-        
-        for pattern in title_patterns:
-            matches = re.findall(pattern, doc.text)
-            if matches:
-                basic_info['title'] = matches[0]
-                break
+        title_match = _TITLE_RE.search(text)
+        if title_match:
+            basic_info['title'] = title_match.group(0)
 
         # Extract location (GPE entities)
         locations = [ent.text for ent in doc.ents if ent.label_ == "GPE"]
@@ -205,35 +411,39 @@ class ResumeParser:
         }
 
         # Extract email
-        email_matches = self.patterns['email'].findall(text)
-        if email_matches:
-            contact_info['email'] = email_matches[0]
+        email_match = self.patterns['email'].search(text)
+        if email_match:
+            contact_info['email'] = email_match.group(0)
 
         # Extract phone
-        phone_matches = self.patterns['phone'].findall(text)
-        if phone_matches:
-            contact_info['phone'] = phone_matches[0]
+        phone_match = self.patterns['phone'].search(text)
+        if phone_match:
+            contact_info['phone'] = phone_match.group(0)
 
-        # Extract URLs
-        urls = self.patterns['url'].findall(text)
-        for url in urls:
+        # Extract URLs, keeping the first of each kind
+        for url_match in self.patterns['url'].finditer(text):
+            url = url_match.group(0)
             if 'linkedin.com' in url:
-                contact_info['linkedin'] = url
+                slot = 'linkedin'
             elif 'github.com' in url:
-                contact_info['github'] = url
+                slot = 'github'
             else:
-                contact_info['website'] = url
+                slot = 'website'
+            if not contact_info[slot]:
+                contact_info[slot] = url
+                if contact_info['linkedin'] and contact_info['github'] and contact_info['website']:
+                    break
 
         return contact_info
 
-    def _extract_education(self, doc: Doc) -> List[Dict[str, str]]:
+    def _extract_education(self, sents: Tuple[Span, ...], sections: Dict[str, str]) -> List[Dict[str, str]]:
         """Extract education information"""
         education = []
-        edu_section = self._find_section(doc.text, ['education', 'academic'])
+        edu_section = sections.get('education')
         
         if edu_section:
             # Process education section
-            for sent in doc.sents:
+            for sent in sents:
                 if self.patterns['education'].search(sent.text):
                     edu_entry = {
                         'degree': '',
@@ -258,8 +468,7 @@ class ResumeParser:
                         edu_entry['date'] = date_match.group()
                     
                     # Extract GPA
-                    gpa_pattern = r'GPA:?\s*(\d+\.\d+)'
-                    gpa_match = re.search(gpa_pattern, sent.text)
+                    gpa_match = _GPA_RE.search(sent.text)
                     if gpa_match:
                         edu_entry['gpa'] = gpa_match.group(1)
                     
@@ -267,10 +476,10 @@ class ResumeParser:
         
         return education
 
-    def _extract_experience(self, doc: Doc) -> List[Dict[str, Any]]:
+    def _extract_experience(self, sents: Tuple[Span, ...], sections: Dict[str, str]) -> List[Dict[str, Any]]:
         """Extract work experience information"""
         experience = []
-        exp_section = self._find_section(doc.text, ['experience', 'work', 'employment'])
+        exp_section = sections.get('experience')
         
         if exp_section:
             current_company = None
@@ -278,7 +487,7 @@ class ResumeParser:
             current_dates = None
             current_responsibilities = []
             
-            for sent in doc.sents:
+            for sent in sents:
                 # New company/position detection
                 orgs = [ent.text for ent in sent.ents if ent.label_ == "ORG"]
                 if orgs:
@@ -295,7 +504,7 @@ class ResumeParser:
                     current_position = self._extract_position(sent.text)
                     current_dates = self._extract_dates(sent.text)
                     current_responsibilities = []
-                elif sent.text.strip().startswith(('â€¢', '-', 'âˆ™')):
+                elif sent.text.strip().startswith(_BULLET_PREFIXES):
                     current_responsibilities.append(sent.text.strip())
             
             # Add last entry
@@ -311,24 +520,27 @@ class ResumeParser:
 
     def _extract_skills(self, doc: Doc) -> Dict[str, List[str]]:
         """Extract skills information"""
-        skills = defaultdict(list)
+        # Matched skill names as a set, so repeated mentions count once
+        found = self._match_skills(doc)
+        if not found:
+            return {}
         
-        # Process each category in skills database
+        # Group matches by category, in skills database order
+        skills = {}
         for category, skill_list in self.skills_db.items():
-            for skill in skill_list:
-                if re.search(rf'\b{skill}\b', doc.text, re.IGNORECASE):
-                    skills[category].append(skill)
+            hits = [skill for skill in skill_list if skill in found]
+            if hits:
+                skills[category] = hits
         
-        return dict(skills)
+        return skills
 
-    def _extract_languages(self, doc: Doc) -> List[Dict[str, str]]:
+    def _extract_languages(self, doc: Doc, sections: Dict[str, str]) -> List[Dict[str, str]]:
         """Extract language proficiencies"""
         languages = []
-        language_section = self._find_section(doc.text, ['languages', 'language skills'])
+        language_section = sections.get('languages')
         
         if language_section:
-            language_pattern = r'(?i)(English|Spanish|French|German|Chinese|Japanese|Korean|Russian|Arabic|Portuguese|Italian)[\s\-]*(Native|Fluent|Professional|Intermediate|Basic)'
-            matches = re.findall(language_pattern, language_section)
+            matches = _LANGUAGE_RE.findall(language_section)
             
             for lang, level in matches:
                 languages.append({
@@ -338,18 +550,18 @@ class ResumeParser:
         
         return languages
 
-    def _extract_projects(self, doc: Doc) -> List[Dict[str, Any]]:
+    def _extract_projects(self, sents: Tuple[Span, ...], sections: Dict[str, str]) -> List[Dict[str, Any]]:
         """Extract project information"""
         projects = []
-        project_section = self._find_section(doc.text, ['projects', 'personal projects'])
+        project_section = sections.get('projects')
         
         if project_section:
             current_project = None
             current_description = []
             current_technologies = []
             
-            for sent in doc.sents:
-                if sent.text.strip().startswith(('â€¢', '-', 'âˆ™')):
+            for sent in sents:
+                if sent.text.strip().startswith(_BULLET_PREFIXES):
                     if current_project:
                         current_description.append(sent.text.strip())
                 else:
@@ -375,14 +587,13 @@ class ResumeParser:
         
         return projects
 
-    def _extract_certifications(self, doc: Doc) -> List[Dict[str, str]]:
+    def _extract_certifications(self, doc: Doc, sections: Dict[str, str]) -> List[Dict[str, str]]:
         """Extract certification information"""
         certifications = []
-        cert_section = self._find_section(doc.text, ['certifications', 'certificates'])
+        cert_section = sections.get('certifications')
         
         if cert_section:
-            cert_pattern = r'(?i)([\w\s]+certification|certificate)[\s\-]*([\w\s]+)'
-            matches = re.findall(cert_pattern, cert_section)
+            matches = _CERT_RE.findall(cert_section)
             
             for cert_type, details in matches:
                 certifications.append({
@@ -392,84 +603,68 @@ class ResumeParser:
         
         return certifications
 
-    def _generate_summary(self, doc: Doc) -> str:
+    def _generate_summary(self, doc: Doc, sents: Tuple[Span, ...]) -> str:
         """Generate a summary of the resume"""
         # Use SpaCy's text rank algorithm to generate summary
-        from spacy.lang.en.stop_words import STOP_WORDS
-        from string import punctuation
-        from heapq import nlargest
-
-        keyword_puncts = punctuation + '\n'
-        word_frequencies = {}
-        
-        for word in doc:
-            if word.text.lower() not in STOP_WORDS and word.text.lower() not in keyword_puncts:
-                if word.text not in word_frequencies.keys():
-                    word_frequencies[word.text] = 1
-                else:
-                    word_frequencies[word.text] += 1
-
-        max_frequency = max(word_frequencies.values())
-        for word in word_frequencies.keys():
-            word_frequencies[word] = word_frequencies[word]/max_frequency
-
-        sentence_tokens = [sent for sent in doc.sents]
-        sentence_scores = {}
-        for sent in sentence_tokens:
-            for word in sent:
-                if word.text.lower() in word_frequencies.keys():
-                    if sent not in sentence_scores.keys():
-                        sentence_scores[sent] = word_frequencies[word.text.lower()]
-                    else:
-                        sentence_scores[sent] += word_frequencies[word.text.lower()]
-
-        select_length = min(3, len(sentence_tokens))
-        summary = nlargest(select_length, sentence_scores, key=sentence_scores.get)
+        attrs = doc.to_array([LOWER, IS_STOP, IS_PUNCT, IS_SPACE])
+        if not len(attrs):
+            return ""
+        lower = attrs[:, 0]
+        keep = ~attrs[:, 1:].any(axis=1)
+        if not keep.any():
+            return ""
+
+        # Normalized frequency of each lowercase word, keyed by its hash
+        words, counts = np.unique(lower[keep], return_counts=True)
+        weights = counts / counts.max()
+
+        # Per-token weight, zero for stop words and punctuation
+        pos = np.minimum(np.searchsorted(words, lower), len(words) - 1)
+        token_scores = np.where(words[pos] == lower, weights[pos], 0.0)
+
+        sentence_tokens = sents
+        starts = np.fromiter((sent.start for sent in sentence_tokens), np.int64, len(sentence_tokens))
+        ends = np.fromiter((sent.end for sent in sentence_tokens), np.int64, len(sentence_tokens))
+        scores = _sentence_scores(token_scores, starts, ends)
+
+        select_length = min(SUMMARY_SENTENCES, int(np.count_nonzero(scores)))
+        if not select_length:
+            return ""
+        top = np.argpartition(-scores, select_length - 1)[:select_length]
+        top = top[np.argsort(-scores[top], kind='stable')]
         
-        return " ".join([sent.text for sent in summary])
+        return " ".join([sentence_tokens[i].text for i in top])
 
-    def _find_section(self, text: str, section_keywords: List[str]) -> Optional[str]:
-        """Find and return specific section from text"""
-        lines = text.split('\n')
-        section_start = -1
-        section_end = -1
+    def _index_sections(self, text: str) -> Dict[str, str]:
+        """Split text into sections keyed by canonical section name"""
+        sections: Dict[str, str] = {}
+        current = None
+        current_lines: List[str] = []
         
-        for i, line in enumerate(lines):
-            # Check if line contains section keyword
-            if any(keyword.lower() in line.lower() for keyword in section_keywords):
-                section_start = i
-                continue
-            
-            # Find next section (indicates end of current section)
-            if section_start != -1 and line.strip() and line[0].isupper():
-                section_end = i
-                break
+        for line in text.split('\n'):
+            heading = _SECTION_RE.match(line)
+            if heading:
+                if current and current not in sections:
+                    sections[current] = '\n'.join(current_lines)
+                current = _SECTION_KEYWORDS[heading.group(1).lower()]
+                current_lines = [line]
+            elif current:
+                current_lines.append(line)
         
-        if section_start != -1:
-            if section_end == -1:
-                section_end = len(lines)
-            return '\n'.join(lines[section_start:section_end])
+        # Keep the first occurrence of each section
+        if current and current not in sections:
+            sections[current] = '\n'.join(current_lines)
         
-        return None
+        return sections
 
     def _extract_position(self, text: str) -> Optional[str]:
         """Extract position title from text"""
-        position_patterns = [
-            r"(?i)(Senior|Lead|Principal|Junior|Software|Data|Product|Project|Business|Marketing|Sales|HR|Human Resources)[\s\w]+",
-            r"(?i)(Engineer|Developer|Scientist|Analyst|Manager|Consultant|Designer|Architect)"
-        ]
-        
-        for pattern in position_patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group()
-        
-        return None
+        match = _TITLE_RE.search(text)
+        return match.group(0) if match else None
 
     def _extract_dates(self, text: str) -> Optional[str]:
         """Extract date ranges from text"""
-        date_pattern = r'(?i)(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[\s\-]?\d{4}'
-        dates = re.findall(date_pattern, text)
+        dates = _DATE_RE.findall(text)
         
         if len(dates) >= 2:
             return f"{dates[0]} - {dates[1]}"
@@ -480,15 +675,18 @@ class ResumeParser:
 
     def _extract_technologies(self, text: str) -> List[str]:
         """Extract technology mentions from text"""
-        technologies = []
+        found = {
+            self._skill_names[match.group(0).lower()]
+            for match in self._skills_re.finditer(text)
+        }
         
         # Check against skills database
-        for category, skills in self.skills_db.items():
-            for skill in skills:
-                if re.search(rf'\b{skill}\b', text, re.IGNORECASE):
-                    technologies.append(skill)
-        
-        return technologies
+        return [
+            skill
+            for skills in self.skills_db.values()
+            for skill in skills
+            if skill in found
+        ]
 
     def _validate_parsed_data(self, data: Dict[str, Any]) -> None:
         """Validate parsed resume data"""
@@ -520,8 +718,8 @@ class ResumeParser:
     def export_to_json(self, parsed_data: Dict[str, Any], output_path: str) -> bool:
         """Export parsed data to JSON file"""
         try:
-            with open(output_path, 'w') as f:
-                json.dump(parsed_data, f, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(parsed_data, option=_EXPORT_JSON_OPTIONS))
             return True
         except Exception as e:
             logger.error(f"Failed to export data: {str(e)}")
@@ -532,13 +730,15 @@ class ResumeParser:
         """Export parsed data to various structured formats"""
         try:
             if format_type == 'json':
-                return json.dumps(parsed_data, indent=2)
+                return orjson.dumps(parsed_data, option=_EXPORT_JSON_OPTIONS).decode()
             elif format_type == 'xml':
                 import dicttoxml
                 return dicttoxml.dicttoxml(parsed_data, custom_root='resume').decode()
             elif format_type == 'yaml':
                 import yaml
-                return yaml.dump(parsed_data)
+                # Use the libyaml-backed emitter when PyYAML was built with it
+                dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+                return yaml.dump(parsed_data, Dumper=dumper)
             else:
                 raise ValueError(f"Unsupported format type: {format_type}")
         except Exception as e:
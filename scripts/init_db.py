@@ -1,11 +1,21 @@
 # scripts/init_db.py
 
+import io
+import csv
 import os
 import sys
+import argparse
+import asyncio
+import subprocess
 from pathlib import Path
 import psycopg2
+import psycopg2.errors
+from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.pool import ThreadedConnectionPool
 import logging
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Add project root to Python path
@@ -19,19 +29,84 @@ from app.config.settings import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default admin settings seeded on first run: (key, value, is_sensitive)
+DEFAULT_ADMIN_SETTINGS = [
+    ('maintenance_mode', 'false', False),
+    ('max_file_size_mb', '10', False),
+    ('default_language', 'en-US', False)
+]
+
+# Admin settings columns, in DEFAULT_ADMIN_SETTINGS tuple order
+ADMIN_SETTINGS_COLUMNS = ('setting_key', 'setting_value', 'is_sensitive')
+
+# Seeds at least this large are loaded with COPY instead of a multi-row INSERT
+COPY_SEED_THRESHOLD = 1000
+
+# Schema DDL, kept next to this script so it can also be run with psql
+SCHEMA_PATH = Path(__file__).with_name('schema.sql')
+
+# Schema DDL read once at import, as bytes ready to send
+_DDL_SQL: bytes = SCHEMA_PATH.read_bytes()
+
+# Session options for the psql fast path; only safe for one-off initialization
+PSQL_FAST_OPTIONS = '-c client_min_messages=warning -c synchronous_commit=off'
+
+# Connection pool bounds for the application database
+POOL_MIN_CONN = 2
+POOL_MAX_CONN = 10
+
+# Connections opened concurrently by warm_pool
+POOL_WARM_CONN = 5
+
+# Shared pool, created on first use so a missing database can still be created
+_POOL = None
+
 class DatabaseInitializer:
     def __init__(self):
         """Initialize database setup"""
-        self.db_params = {
+        self.db_params = self._params()
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _params(cls):
+        """Resolve connection parameters from settings once, as a read-only mapping"""
+        return MappingProxyType({
             'host': settings.DB_HOST,
             'port': settings.DB_PORT,
             'user': settings.DB_USER,
             'password': settings.DB_PASSWORD.get_secret_value(),
             'dbname': settings.DB_NAME
-        }
-
-    def init_database(self):
-        """Initialize the database"""
+        })
+
+    def _get_conn(self):
+        """Borrow a connection from the shared pool, creating it on first use"""
+        global _POOL
+        if _POOL is None:
+            _POOL = ThreadedConnectionPool(POOL_MIN_CONN, POOL_MAX_CONN, **self.db_params)
+        return _POOL.getconn()
+
+    def _put_conn(self, conn):
+        """Return a borrowed connection to the shared pool"""
+        if _POOL is not None:
+            _POOL.putconn(conn)
+
+    def close(self):
+        """Close every pooled connection"""
+        global _POOL
+        if _POOL is not None:
+            _POOL.closeall()
+            _POOL = None
+
+    def init_database(self, fast: bool = False):
+        """
+        Initialize the database
+        
+        Args:
+            fast: Load the schema with psql instead of through psycopg2
+            
+        Returns:
+            bool: True if initialization succeeded
+        """
         try:
             # First, connect to PostgreSQL without specifying a database
             conn = psycopg2.connect(
@@ -43,21 +118,38 @@ class DatabaseInitializer:
             conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
             cur = conn.cursor()
 
-            # Create database if it doesn't exist
+            # Create database if it doesn't exist. The probe keeps reruns
+            # working for roles without CREATEDB, which PostgreSQL rejects
+            # before it checks for a duplicate name
             cur.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s",
                        (self.db_params['dbname'],))
             if not cur.fetchone():
-                cur.execute(f"CREATE DATABASE {self.db_params['dbname']}")
-                logger.info(f"Database {self.db_params['dbname']} created successfully")
+                try:
+                    cur.execute(
+                        sql.SQL("CREATE DATABASE {}").format(sql.Identifier(self.db_params['dbname']))
+                    )
+                    logger.info(f"Database {self.db_params['dbname']} created successfully")
+                except psycopg2.errors.DuplicateDatabase:
+                    # Created concurrently since the probe
+                    pass
             
             cur.close()
             conn.close()
 
-            # Connect to the new database and create tables
-            self._create_tables()
-            
-            # Initialize default data
-            self._init_default_data()
+            if fast:
+                self._load_schema_with_psql()
+
+            # Create tables and seed defaults in a single transaction
+            conn = self._get_conn()
+            try:
+                with conn:
+                    if fast:
+                        with conn.cursor() as cur:
+                            self._seed_defaults(cur)
+                    else:
+                        self._create_tables(conn)
+            finally:
+                self._put_conn(conn)
 
             logger.info("Database initialization completed successfully")
             return True
@@ -66,194 +158,194 @@ class DatabaseInitializer:
             logger.error(f"Database initialization failed: {str(e)}")
             return False
 
-    def _create_tables(self):
-        """Create database tables"""
+    def _create_tables(self, conn):
+        """
+        Create database tables and seed default data in one round-trip
+        
+        Args:
+            conn: Open connection; the caller owns the transaction
+        """
         try:
-            conn = psycopg2.connect(**self.db_params)
-            cur = conn.cursor()
+            with conn.cursor() as cur:
+                if len(DEFAULT_ADMIN_SETTINGS) < COPY_SEED_THRESHOLD:
+                    # Create tables, with the default admin settings appended
+                    cur.execute(_DDL_SQL + self._seed_sql(cur))
+                else:
+                    cur.execute(_DDL_SQL)
+                    self._seed_defaults(cur)
 
-            # Create tables
-            cur.execute("""
-                -- Users table
-                CREATE TABLE IF NOT EXISTS users (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    name VARCHAR(100) NOT NULL,
-                    email VARCHAR(255) UNIQUE,
-                    phone VARCHAR(20) UNIQUE,
-                    password_hash VARCHAR(255),
-                    subscription_plan VARCHAR(50) DEFAULT 'free',
-                    subscription_end_date TIMESTAMP,
-                    interviews_remaining INTEGER DEFAULT 1,
-                    stripe_customer_id VARCHAR(255),
-                    stripe_subscription_id VARCHAR(255),
-                    avatar_url TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                -- Resumes table
-                CREATE TABLE IF NOT EXISTS resumes (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    user_id UUID REFERENCES users(id),
-                    file_path TEXT NOT NULL,
-                    parsed_data JSONB,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                -- Interviews table
-                CREATE TABLE IF NOT EXISTS interviews (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    user_id UUID REFERENCES users(id),
-                    resume_id UUID REFERENCES resumes(id),
-                    company_name VARCHAR(100),
-                    company_website TEXT,
-                    job_description TEXT,
-                    total_score INTEGER,
-                    feedback JSONB,
-                    recording_url TEXT,
-                    transcript TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                -- Support Tickets table
-                CREATE TABLE IF NOT EXISTS support_tickets (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    user_id UUID REFERENCES users(id),
-                    category VARCHAR(50) NOT NULL,
-                    subject VARCHAR(255) NOT NULL,
-                    description TEXT NOT NULL,
-                    priority VARCHAR(20) DEFAULT 'medium',
-                    status VARCHAR(20) DEFAULT 'open',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                -- Ticket Updates table
-                CREATE TABLE IF NOT EXISTS ticket_updates (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    ticket_id UUID REFERENCES support_tickets(id),
-                    user_id UUID REFERENCES users(id),
-                    message TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                -- Notifications table
-                CREATE TABLE IF NOT EXISTS notifications (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    user_id UUID REFERENCES users(id),
-                    type VARCHAR(50) NOT NULL,
-                    title VARCHAR(255) NOT NULL,
-                    message TEXT NOT NULL,
-                    read BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                -- Admin Settings table
-                CREATE TABLE IF NOT EXISTS admin_settings (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    setting_key VARCHAR(100) UNIQUE NOT NULL,
-                    setting_value TEXT,
-                    is_sensitive BOOLEAN DEFAULT FALSE,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                -- Feedback table
-                CREATE TABLE IF NOT EXISTS feedback (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    user_id UUID REFERENCES users(id),
-                    interview_id UUID REFERENCES interviews(id),
-                    rating INTEGER CHECK (rating >= 1 AND rating <= 5),
-                    comments TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                -- Create updated_at triggers
-                CREATE OR REPLACE FUNCTION update_updated_at_column()
-                RETURNS TRIGGER AS $$
-                BEGIN
-                    NEW.updated_at = CURRENT_TIMESTAMP;
-                    RETURN NEW;
-                END;
-                $$ language 'plpgsql';
-
-                CREATE TRIGGER update_users_updated_at
-                    BEFORE UPDATE ON users
-                    FOR EACH ROW
-                    EXECUTE FUNCTION update_updated_at_column();
-
-                CREATE TRIGGER update_support_tickets_updated_at
-                    BEFORE UPDATE ON support_tickets
-                    FOR EACH ROW
-                    EXECUTE FUNCTION update_updated_at_column();
-            """)
-
-            conn.commit()
-            logger.info("Database tables created successfully")
+            logger.info("Database tables and default data created successfully")
 
         except Exception as e:
             logger.error(f"Error creating tables: {str(e)}")
             raise
-        finally:
-            cur.close()
-            conn.close()
-
-    def _init_default_data(self):
-        """Initialize default data"""
-        try:
-            conn = psycopg2.connect(**self.db_params)
-            cur = conn.cursor()
-
-            # Insert default admin settings
-            cur.execute("""
-                INSERT INTO admin_settings (setting_key, setting_value, is_sensitive)
-                VALUES 
-                    ('maintenance_mode', 'false', false),
-                    ('max_file_size_mb', '10', false),
-                    ('default_language', 'en-US', false)
-                ON CONFLICT (setting_key) DO NOTHING;
-            """)
 
-            conn.commit()
-            logger.info("Default data initialized successfully")
+    def _seed_sql(self, cur) -> bytes:
+        """
+        Build the default admin settings insert
+        
+        Args:
+            cur: Cursor used to quote the values
+            
+        Returns:
+            bytes: A single multi-row INSERT statement
+        """
+        seed_values = b", ".join(
+            cur.mogrify("(%s, %s, %s)", row) for row in DEFAULT_ADMIN_SETTINGS
+        )
+        return (
+            b"INSERT INTO admin_settings (setting_key, setting_value, is_sensitive) "
+            b"VALUES " + seed_values + b" ON CONFLICT (setting_key) DO NOTHING;"
+        )
+
+    def _seed_defaults(self, cur):
+        """
+        Insert the default admin settings, using COPY for large seeds
+        
+        Args:
+            cur: Cursor inside the caller's transaction
+        """
+        if len(DEFAULT_ADMIN_SETTINGS) < COPY_SEED_THRESHOLD:
+            cur.execute(self._seed_sql(cur))
+        else:
+            self._bulk_seed(
+                cur, 'admin_settings', ADMIN_SETTINGS_COLUMNS,
+                DEFAULT_ADMIN_SETTINGS, conflict='setting_key'
+            )
 
+    def _bulk_seed(self, cur, table: str, columns: tuple, rows: list, conflict: str):
+        """
+        Load rows through a COPY into a staging table, skipping existing keys
+        
+        Args:
+            cur: Cursor inside the caller's transaction
+            table: Target table
+            columns: Column names, in row order
+            rows: Row tuples to load
+            conflict: Unique column whose existing values are left untouched
+        """
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        buf.seek(0)
+
+        stage = sql.Identifier(f"{table}_seed")
+        cols = sql.SQL(', ').join(map(sql.Identifier, columns))
+        cur.execute(sql.SQL(
+            "CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS) ON COMMIT DROP"
+        ).format(stage, sql.Identifier(table)))
+        cur.copy_expert(
+            sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(stage, cols),
+            buf
+        )
+        cur.execute(sql.SQL(
+            "INSERT INTO {} ({}) SELECT {} FROM {} ON CONFLICT ({}) DO NOTHING"
+        ).format(sql.Identifier(table), cols, cols, stage, sql.Identifier(conflict)))
+
+    def _load_schema_with_psql(self):
+        """Load schema.sql in a single psql transaction"""
+        try:
+            env = os.environ.copy()
+            env['PGPASSWORD'] = self.db_params['password']
+            env['PGOPTIONS'] = PSQL_FAST_OPTIONS
+            subprocess.run(
+                [
+                    'psql',
+                    '-v', 'ON_ERROR_STOP=1',
+                    '--single-transaction',
+                    '-h', str(self.db_params['host']),
+                    '-p', str(self.db_params['port']),
+                    '-U', self.db_params['user'],
+                    '-d', self.db_params['dbname'],
+                    '-f', str(SCHEMA_PATH)
+                ],
+                env=env,
+                check=True
+            )
+            logger.info("Database schema loaded with psql")
         except Exception as e:
-            logger.error(f"Error initializing default data: {str(e)}")
+            logger.error(f"Error loading schema with psql: {str(e)}")
             raise
-        finally:
-            cur.close()
-            conn.close()
 
     def check_connection(self) -> bool:
         """Test database connection"""
         try:
-            conn = psycopg2.connect(**self.db_params)
-            conn.close()
+            conn = self._get_conn()
+            try:
+                with conn, conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+            finally:
+                self._put_conn(conn)
             return True
         except Exception as e:
             logger.error(f"Database connection test failed: {str(e)}")
             return False
 
+    def warm_pool(self, n: int = POOL_WARM_CONN):
+        """
+        Open and test n pooled connections concurrently
+        
+        Args:
+            n: Number of connections to warm
+        """
+        def warm_one():
+            conn = self._get_conn()
+            try:
+                with conn, conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+            except Exception:
+                self._put_conn(conn)
+                raise
+            return conn
+
+        async def warm():
+            # Hold every connection until all are open so each worker gets its own
+            results = await asyncio.gather(
+                *(asyncio.to_thread(warm_one) for _ in range(n)),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(f"Connection warm-up failed: {str(result)}")
+                else:
+                    self._put_conn(result)
+
+        # Create the pool up front so the workers do not race to build it
+        self._put_conn(self._get_conn())
+        asyncio.run(warm())
+
 def main():
     """Main function to initialize database"""
+    parser = argparse.ArgumentParser(description="Initialize the application database")
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help="load schema.sql with psql (requires psql on PATH)"
+    )
+    args = parser.parse_args()
+
     # Initialize database
     db_init = DatabaseInitializer()
     
-    # Test connection
-    print("\nTesting database connection...")
-    if not db_init.check_connection():
-        print("The Database connection failed. Please check your settings.")
-        return False
+    try:
+        # Test connection
+        print("\nTesting database connection...")
+        if not db_init.check_connection():
+            print("The Database connection failed. Please check your settings.")
+            return False
 
-    print("Database connection successful")
-    
-    # Initialize database
-    print("\nInitializing database...")
-    if db_init.init_database():
-        print("Database initialized successfully")
-        return True
-    else:
-        print("Database initialization failed")
-        return False
+        print("Database connection successful")
+        db_init.warm_pool()
+        
+        # Initialize database
+        print("\nInitializing database...")
+        if db_init.init_database(fast=args.fast):
+            print("Database initialized successfully")
+            return True
+        else:
+            print("Database initialization failed")
+            return False
+    finally:
+        db_init.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,55 @@
 import os
-import json
+import shutil
+import argparse
+import functools
 from pathlib import Path
 import subprocess
 import sys
 
-def setup_google_cloud():
-    """Setup Google Cloud credentials"""
+# Startup file, relative to the home directory, for each supported shell
+SHELL_RC = {
+    'bash': '.bashrc',
+    'zsh': '.zshrc',
+    'fish': '.config/fish/config.fish',
+    'sh': '.profile'
+}
+
+@functools.cache
+def _shell_rc_file() -> Path:
+    """Resolve the current user's shell startup file from $SHELL"""
+    shell = os.path.basename(os.environ.get('SHELL', '/bin/bash'))
+    return Path.home() / SHELL_RC.get(shell, '.profile')
+
+def _set_windows_user_env(name: str, value: str):
+    """
+    Persist a user environment variable in the registry and notify running apps
+    
+    Args:
+        name: Variable name
+        value: Variable value
+    """
+    import ctypes
+    import winreg
+
+    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, 'Environment', 0, winreg.KEY_SET_VALUE) as key:
+        winreg.SetValueEx(key, name, 0, winreg.REG_EXPAND_SZ, value)
+
+    # Broadcast WM_SETTINGCHANGE to all top-level windows (HWND_BROADCAST)
+    HWND_BROADCAST = 0xFFFF
+    WM_SETTINGCHANGE = 0x1A
+    SMTO_ABORTIFHUNG = 0x0002
+    ctypes.windll.user32.SendMessageTimeoutW(
+        HWND_BROADCAST, WM_SETTINGCHANGE, 0, 'Environment',
+        SMTO_ABORTIFHUNG, 5000, ctypes.byref(ctypes.c_ulong())
+    )
+
+def setup_google_cloud(creds_file: str = None):
+    """
+    Setup Google Cloud credentials
+    
+    Args:
+        creds_file: Path to the service account JSON key; prompted for if omitted
+    """
     print("\nGoogle Cloud Setup")
     print("-----------------")
     
@@ -22,11 +66,14 @@ def setup_google_cloud():
     print("4. Create a service account and download the JSON key file")
     
     # Get credentials file path
-    while True:
+    if creds_file and not os.path.exists(creds_file):
+        print(f"File not found: {creds_file}")
+        creds_file = None
+    while not creds_file:
         creds_file = input("\nEnter path to your credentials JSON file: ").strip()
-        if os.path.exists(creds_file):
-            break
-        print("File not found. Please try again.")
+        if not os.path.exists(creds_file):
+            print("File not found. Please try again.")
+            creds_file = None
     
     # Create credentials directory if it doesn't exist
     creds_dir = Path.home() / '.google-cloud'
@@ -35,19 +82,24 @@ def setup_google_cloud():
     # Copy credentials to a secure location
     target_path = creds_dir / 'beaver-credentials.json'
     try:
-        with open(creds_file, 'r') as source:
-            creds_data = json.load(source)
-        with open(target_path, 'w') as target:
-            json.dump(creds_data, target)
+        shutil.copyfile(creds_file, target_path)
         
         # Set environment variable
         if sys.platform.startswith('win'):
-            os.system(f'setx GOOGLE_APPLICATION_CREDENTIALS "{target_path}"')
+            _set_windows_user_env('GOOGLE_APPLICATION_CREDENTIALS', str(target_path))
         else:
-            shell = os.path.basename(os.environ.get('SHELL', '/bin/bash'))
-            rc_file = Path.home() / f'.{shell}rc'
-            with open(rc_file, 'a') as f:
-                f.write(f'\nexport GOOGLE_APPLICATION_CREDENTIALS="{target_path}"\n')
+            # Resolve symlinks so a managed dotfile is updated, not replaced
+            rc_file = _shell_rc_file().resolve()
+            rc_file.parent.mkdir(parents=True, exist_ok=True)
+            line = f'export GOOGLE_APPLICATION_CREDENTIALS="{target_path}"'
+            text = rc_file.read_text() if rc_file.exists() else ''
+            # Skip on rerun; otherwise write a copy and swap it in atomically
+            if line not in text:
+                tmp_file = rc_file.with_name(rc_file.name + '.tmp')
+                tmp_file.write_text(f'{text}\n{line}\n')
+                if rc_file.exists():
+                    shutil.copymode(rc_file, tmp_file)
+                os.replace(tmp_file, rc_file)
         
         print(f"\nâœ“ Credentials saved to: {target_path}")
         print(f"âœ“ Environment variable GOOGLE_APPLICATION_CREDENTIALS set")
@@ -60,4 +112,7 @@ def setup_google_cloud():
     return True
 
 if __name__ == "__main__":
-    setup_google_cloud()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Set up Google Cloud credentials")
+    parser.add_argument('--creds', help="path to the service account JSON key file")
+    args = parser.parse_args()
+    setup_google_cloud(args.creds)
\ No newline at end of file